@@ -1,19 +1,34 @@
+import os
+
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 
+from .commands import register_commands
 from .config import config_by_name
-from .database import db
+from .database import configure_engine, db, engine_options
+from .services.auth_service import init_user_cache
+from .services.password_service import PasswordHasherBusy
+from .services.live_service import live_feed
+from .services.revocation_service import revocation_store
+from .utils import error_response
+from .utils.cache import analytics_cache
+from .utils.compression import compressor
+from .utils.json_provider import FastJSONProvider, ISOJSONProvider
+from .utils.metrics import metrics
 
 # Import Blueprints
 from .routes.auth_routes import auth_bp
+from .routes.health_routes import health_bp
 from .routes.parcel_routes import parcel_bp
 from .routes.postponed_routes import postponed_bp
 from .routes.user_routes import user_bp
 from .routes.dashboard_routes import dashboard_bp
 from .routes.expense_routes import expense_bp
 from .routes.expense_category_routes import expense_category_bp
+from .routes.change_routes import change_bp
+from .routes.event_routes import event_bp
 
 
 
@@ -25,6 +40,9 @@ def create_app(config_name='development'):
 
     # Load environment configurations
     app.config.from_object(config_by_name[config_name])
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    # Either way datetimes go out as ISO 8601
+    app.json = FastJSONProvider(app) if app.config.get('FAST_JSON', True) else ISOJSONProvider(app)
 
 
     # Initialize extensions
@@ -34,8 +52,23 @@ def create_app(config_name='development'):
         CORS(app, resources={r"/api/*": {"origins": ["http://lkok8cs0co0w8o4oos800s4g.161.97.125.199.sslip.io", "http://localhost:3000", "http://localhost:5177", "http://127.0.0.1:5178"]}})
     
     db.init_app(app)
-    JWTManager(app)
-    Migrate(app, db)
+    configure_engine(app)
+    jwt = JWTManager(app)
+    revocation_store.init_app(app, jwt)
+    # Absolute so `flask db ...` and the startup check work from any directory
+    Migrate(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
+    analytics_cache.init_app(app)
+    metrics.init_app(app)
+    compressor.init_app(app)
+    live_feed.init_app(app)
+    init_user_cache(app)
+    register_commands(app)
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        response, status = error_response("Too many sign-ins in progress, try again shortly", "BUSY", 503)
+        response.headers['Retry-After'] = '1'
+        return response, status
 
     # -----------------------
     # ROOT HOMEPAGE
@@ -96,6 +129,7 @@ def create_app(config_name='development'):
         """
 
     # Register blueprints
+    app.register_blueprint(health_bp)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(parcel_bp, url_prefix="/api/parcels")
     app.register_blueprint(postponed_bp, url_prefix="/api/postponed")
@@ -103,6 +137,8 @@ def create_app(config_name='development'):
     app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
     app.register_blueprint(expense_bp, url_prefix="/api/expenses")
     app.register_blueprint(expense_category_bp, url_prefix="/api/expense-categories")
+    app.register_blueprint(change_bp, url_prefix="/api/changes")
+    app.register_blueprint(event_bp, url_prefix="/api/events")
 
 
     return app
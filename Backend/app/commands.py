@@ -0,0 +1,133 @@
+import signal
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.services.analytics_service import rebuild_revenue_rollup
+from app.services.job_service import JobWorker, job_counts, requeue_dead
+from app.services.overdue_service import mark_overdue
+from app.services.query_plan_service import check_query_plans
+from app.services.schema_service import upgrade_if_needed
+from app.services.search_service import rebuild_search_index
+from app.services.status_service import rebuild_status_counters
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Create or repopulate the parcel search index."""
+    backend = rebuild_search_index()
+    click.echo(f"Parcel search index rebuilt (backend: {backend})")
+
+
+@click.command('rebuild-status-counters')
+@with_appcontext
+def rebuild_status_counters_command():
+    """Recompute parcel_status_counters from the parcels table."""
+    counts = rebuild_status_counters()
+    for status, count in counts.items():
+        click.echo(f"{status}: {count}")
+
+
+@click.command('rebuild-revenue-rollup')
+@with_appcontext
+def rebuild_revenue_rollup_command():
+    """Backfill revenue_monthly from paid parcels."""
+    months = rebuild_revenue_rollup()
+    click.echo(f"Revenue rollup rebuilt ({months} months)")
+
+
+@click.command('check-query-plans')
+@click.option('--verbose', '-v', is_flag=True, help='Print every plan, not just failures.')
+@with_appcontext
+def check_query_plans_command(verbose):
+    """Fail if a hot list/stats query plans a full table scan."""
+    failures = 0
+    for name, lines, scans in check_query_plans():
+        if scans:
+            failures += 1
+            click.echo(f"FAIL {name}: full scan of {', '.join(scans)}")
+        else:
+            click.echo(f"ok   {name}")
+        if scans or verbose:
+            for line in lines:
+                click.echo(f"       {line}")
+
+    if failures:
+        raise click.ClickException(f"{failures} hot queries are missing an index")
+
+
+@click.command('migrate-if-needed')
+@with_appcontext
+def migrate_if_needed_command():
+    """Upgrade the database to the latest migration unless it is already there."""
+    current, heads = upgrade_if_needed()
+    if current == heads:
+        click.echo(f"Schema up to date ({', '.join(sorted(heads))})")
+    else:
+        click.echo(f"Schema upgraded from {', '.join(sorted(current)) or 'empty'} to {', '.join(sorted(heads))}")
+
+
+@click.command('run-jobs')
+@click.option('--once', is_flag=True, help='Exit when no jobs are due instead of polling.')
+@click.option('--batch-size', type=int, help='Jobs claimed per poll (default JOB_BATCH_SIZE).')
+@click.option('--concurrency', type=int, help='Handler threads (default JOB_CONCURRENCY).')
+@with_appcontext
+def run_jobs_command(once, batch_size, concurrency):
+    """Run queued background jobs (emails and other side effects)."""
+    worker = JobWorker(current_app._get_current_object(), batch_size, concurrency)
+    # Finish the batch in hand on shutdown instead of leaving it to the lease
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run(once=once)
+    except KeyboardInterrupt:
+        worker.stop()
+    click.echo(', '.join(f"{status}: {count}" for status, count in job_counts().items()))
+
+
+@click.command('requeue-dead-jobs')
+@click.option('--kind', help='Only jobs of this kind.')
+@with_appcontext
+def requeue_dead_jobs_command(kind):
+    """Queue dead-lettered jobs again with a fresh set of attempts."""
+    click.echo(f"Requeued {requeue_dead(kind)} jobs")
+
+
+@click.command('smtp-sink')
+@click.option('--port', default=1025, show_default=True)
+def smtp_sink_command(port):
+    """Local SMTP server that prints what it receives (MAIL_BACKEND=smtp, MAIL_PORT=<port>)."""
+    from app.utils.smtp_sink import SMTPSink
+
+    def show(envelope, message):
+        click.echo(f"--- {envelope['from']} -> {', '.join(envelope['to'])}\n{message}")
+
+    with SMTPSink(port=port, on_message=show) as sink:
+        click.echo(f"Listening on 127.0.0.1:{sink.port}")
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@click.command('mark-overdue')
+@click.option('--full', is_flag=True, help='Ignore the watermarks and re-check every row.')
+@click.option('--chunk-size', type=int, help='Parcels updated per transaction (default OVERDUE_CHUNK_SIZE).')
+@with_appcontext
+def mark_overdue_command(full, chunk_size):
+    """Move stale pending and past-due postponed parcels to overdue."""
+    moved = mark_overdue(full=full, chunk_size=chunk_size)
+    click.echo(f"Marked overdue: {moved['pending']} pending, {moved['postponed']} postponed")
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(rebuild_status_counters_command)
+    app.cli.add_command(rebuild_revenue_rollup_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(migrate_if_needed_command)
+    app.cli.add_command(run_jobs_command)
+    app.cli.add_command(requeue_dead_jobs_command)
+    app.cli.add_command(smtp_sink_command)
+    app.cli.add_command(mark_overdue_command)
@@ -7,6 +7,108 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt_dev_key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Serve status counts from the maintained parcel_status_counters table.
+    # Run `flask rebuild-status-counters` once after turning this on.
+    PARCEL_STATUS_COUNTERS = os.environ.get('PARCEL_STATUS_COUNTERS', 'false').lower() == 'true'
+    # Dashboard analytics cache: 'memory' (per worker), 'sqlite' (shared by all workers) or 'none'
+    ANALYTICS_CACHE_BACKEND = os.environ.get('ANALYTICS_CACHE_BACKEND', 'memory')
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 60))
+    ANALYTICS_CACHE_PATH = os.environ.get('ANALYTICS_CACHE_PATH', '/tmp/joyful_analytics_cache.db')
+    # How often each worker pulls new revocations from revoked_tokens, and
+    # how often expired rows are deleted
+    TOKEN_REVOCATION_SYNC_SECONDS = float(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', 1))
+    TOKEN_REVOCATION_PRUNE_SECONDS = float(os.environ.get('TOKEN_REVOCATION_PRUNE_SECONDS', 300))
+    # Per-worker LRU of user records used by the auth checks
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    # werkzeug hash method, e.g. 'scrypt:16384:8:1' or 'pbkdf2:sha256:600000'.
+    # Stored hashes using anything else are upgraded on the next login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    # Threads per worker that compute hashes (0 hashes inline), how many
+    # more requests may queue for them, and how long one waits for a slot
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_BACKLOG = int(os.environ.get('PASSWORD_HASH_BACKLOG', 32))
+    PASSWORD_HASH_WAIT = float(os.environ.get('PASSWORD_HASH_WAIT', 5))
+    # Password reset links point here and stay valid this many seconds
+    FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
+    PASSWORD_RESET_MAX_AGE = int(os.environ.get('PASSWORD_RESET_MAX_AGE', 3600))
+    # Outgoing mail, sent by the job worker: 'console' logs it, 'smtp' sends
+    # through MAIL_SERVER, 'memory' keeps it in email_service.outbox (tests)
+    MAIL_BACKEND = os.environ.get('MAIL_BACKEND', 'console')
+    MAIL_SERVER = os.environ.get('MAIL_SERVER', 'localhost')
+    MAIL_PORT = int(os.environ.get('MAIL_PORT', 25))
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'false').lower() == 'true'
+    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_FROM = os.environ.get('MAIL_FROM', 'Joyful Cargo <no-reply@joyfulcargo.local>')
+    MAIL_TIMEOUT = int(os.environ.get('MAIL_TIMEOUT', 10))
+    # Background jobs (`flask run-jobs`): jobs claimed per poll, handler
+    # threads, idle poll interval, how long a claimed job may run before it
+    # is presumed lost, retry backoff (doubling from BASE up to MAX) and how
+    # long finished jobs are kept
+    JOB_BATCH_SIZE = int(os.environ.get('JOB_BATCH_SIZE', 50))
+    JOB_CONCURRENCY = int(os.environ.get('JOB_CONCURRENCY', 4))
+    JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 1))
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 300))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+    JOB_RETRY_BASE_SECONDS = float(os.environ.get('JOB_RETRY_BASE_SECONDS', 30))
+    JOB_RETRY_MAX_SECONDS = float(os.environ.get('JOB_RETRY_MAX_SECONDS', 3600))
+    JOB_RETENTION_HOURS = int(os.environ.get('JOB_RETENTION_HOURS', 24))
+    # Overdue detection (`flask mark-overdue`, or queued by the job worker
+    # every OVERDUE_INTERVAL_SECONDS; 0 turns the schedule off): pending
+    # parcels this many days old become overdue; rows updated per transaction
+    OVERDUE_PENDING_DAYS = int(os.environ.get('OVERDUE_PENDING_DAYS', 7))
+    OVERDUE_INTERVAL_SECONDS = int(os.environ.get('OVERDUE_INTERVAL_SECONDS', 900))
+    OVERDUE_CHUNK_SIZE = int(os.environ.get('OVERDUE_CHUNK_SIZE', 1000))
+    # GET /api/changes: how long the cursor waits at a missing change id
+    # (an open transaction may still commit it) before taking it as rolled
+    # back, how long changes are kept, and how often the job worker prunes
+    # them (0 turns pruning off)
+    CHANGES_GAP_SECONDS = float(os.environ.get('CHANGES_GAP_SECONDS', 60))
+    CHANGES_RETENTION_DAYS = int(os.environ.get('CHANGES_RETENTION_DAYS', 7))
+    CHANGES_PRUNE_INTERVAL_SECONDS = int(os.environ.get('CHANGES_PRUNE_INTERVAL_SECONDS', 3600))
+    # GET /api/events (Server-Sent Events): streams per worker (each holds a
+    # gunicorn thread, see gunicorn.conf.py), how often the worker's producer
+    # polls for changes, least time between dashboard recomputes, keep-alive
+    # comment interval, client reconnect delay, events buffered for a slow
+    # client before it is dropped, parcel statuses remembered to tell
+    # status changes from other edits
+    SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', 8))
+    SSE_POLL_SECONDS = float(os.environ.get('SSE_POLL_SECONDS', 1))
+    SSE_DEBOUNCE_SECONDS = float(os.environ.get('SSE_DEBOUNCE_SECONDS', 2))
+    SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_RETRY_SECONDS = float(os.environ.get('SSE_RETRY_SECONDS', 5))
+    SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', 100))
+    SSE_STATUS_CACHE_SIZE = int(os.environ.get('SSE_STATUS_CACHE_SIZE', 10000))
+    # /metrics: each worker writes its totals to METRICS_DIR so the endpoint
+    # can report all of them; unset reports only the serving worker
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 1))
+    # Log requests slower than this with their slowest queries; 0 disables
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 1000))
+    # Encode responses with orjson (falls back to the stdlib if it isn't
+    # installed); false uses the stdlib provider. Dates are ISO 8601 either way
+    FAST_JSON = os.environ.get('FAST_JSON', 'true').lower() == 'true'
+    # Response compression: encodings in order of preference ('br' needs the
+    # brotli package; empty disables) and the smallest body worth compressing
+    COMPRESS_ALGORITHMS = os.environ.get('COMPRESS_ALGORITHMS', 'br,gzip')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    # Database engine and connection pool (per worker process); see app/database.py
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Seconds before a pooled connection is replaced; -1 keeps them forever
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # Test connections on checkout so ones killed by a Postgres restart are replaced
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    # Postgres per-statement timeout in milliseconds; 0 disables it
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    # Connect through PgBouncer in transaction pooling mode: no app-side pool
+    # and no startup parameters; the statement timeout is set per transaction
+    DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'false').lower() == 'true'
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -15,6 +117,9 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    ANALYTICS_CACHE_BACKEND = os.environ.get('ANALYTICS_CACHE_BACKEND', 'sqlite')
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    METRICS_DIR = os.environ.get('METRICS_DIR', '/tmp/joyful_metrics')
 
 config_by_name = {
     'development': DevelopmentConfig,
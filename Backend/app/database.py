@@ -1,3 +1,71 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS built from the DB_* settings in app/config.py.
+
+    SQLite keeps Flask-SQLAlchemy's own pool setup; only Postgres gets the
+    pool sizing, connect timeout and statement timeout.
+    """
+    options = {'pool_pre_ping': config['DB_POOL_PRE_PING']}
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri or make_url(uri).get_backend_name() != 'postgresql':
+        return options
+
+    connect_args = {'connect_timeout': config['DB_CONNECT_TIMEOUT']}
+    if config['DB_PGBOUNCER']:
+        # PgBouncer owns the pool; holding idle server connections here
+        # would defeat it, and it rejects the `options` startup parameter
+        options['poolclass'] = NullPool
+    else:
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+            pool_recycle=config['DB_POOL_RECYCLE']
+        )
+        if config['DB_STATEMENT_TIMEOUT_MS']:
+            connect_args['options'] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+
+    options['connect_args'] = connect_args
+    return options
+
+
+def configure_engine(app):
+    """Engine hooks that can't be expressed as create_engine() options."""
+    timeout = app.config['DB_STATEMENT_TIMEOUT_MS']
+    if not (app.config['DB_PGBOUNCER'] and timeout):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'postgresql':
+        return
+
+    # Session-level SETs would leak to other clients through a transaction
+    # pooler, so scope the timeout to each transaction instead
+    @event.listens_for(engine, 'begin')
+    def _set_statement_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def pool_status():
+    """Live numbers for the current worker's connection pool."""
+    pool = db.engine.pool
+    status = {'class': type(pool).__name__}
+    if hasattr(pool, 'checkedout'):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool.overflow() starts at -size; only positive values are
+            # connections opened beyond pool_size
+            overflow=max(pool.overflow(), 0)
+        )
+    return status
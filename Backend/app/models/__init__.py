@@ -4,3 +4,10 @@ from .parcel import Parcel
 from .postponed_order import PostponedOrder
 from .expense import Expense
 from .expense_category import ExpenseCategory
+from .parcel_status_counter import ParcelStatusCounter
+from .revenue_monthly import RevenueMonthly
+from .revoked_token import RevokedToken
+from .table_version import TableVersion
+from .job import Job
+from .watermark import Watermark
+from .change import Change
@@ -0,0 +1,15 @@
+from datetime import datetime
+from app.database import db
+
+CHANGE_OPS = ('insert', 'update', 'delete')
+
+class Change(db.Model):
+    __tablename__ = 'changes'
+
+    # Append-only log of writes to parcels, expenses and postponed orders,
+    # read in id order by GET /api/changes (see app.services.change_service)
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
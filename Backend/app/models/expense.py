@@ -1,24 +1,29 @@
 from datetime import datetime
 from app.database import db
+from app.utils.serializers import Serializer, Related
 
 class Expense(db.Model):
     __tablename__ = 'expenses'
+    __table_args__ = (
+        # Category/creator filters on the date-ordered expense list
+        db.Index('ix_expenses_category_id_date', 'category_id', 'date'),
+        db.Index('ix_expenses_user_id_date', 'user_id', 'date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    category_id = db.Column(db.Integer, db.ForeignKey('expense_categories.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('expense_categories.id'), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     description = db.Column(db.String(255), nullable=True)
     amount = db.Column(db.Float, nullable=False)
-    date = db.Column(db.DateTime, default=datetime.utcnow)
+    date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'category_id': self.category_id,
-            'category_name': self.category.name if self.category else "Unknown",
-            'user_id': self.user_id,
-            'user_name': self.creator.name if self.creator else "Unknown",
-            'description': self.description,
-            'amount': self.amount,
-            'date': self.date.isoformat()
-        }
\ No newline at end of file
+    serializer = Serializer(
+        columns=('id', 'category_id', 'user_id', 'description', 'amount', 'date'),
+        related={
+            'category_name': Related('category', 'name', default="Unknown"),
+            'user_name': Related('creator', 'name', default="Unknown")
+        }
+    )
+
+    def to_dict(self, fields=None):
+        return self.serializer.dump(self, fields)
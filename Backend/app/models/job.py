@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.database import db
+
+JOB_STATUSES = ('queued', 'running', 'done', 'dead')
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Workers claim the earliest due queued jobs
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    # Durable queue for slow side effects; see app.services.job_service
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    # queued, running, done, dead (gave up after max_attempts)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(64), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
@@ -1,8 +1,20 @@
 from datetime import datetime
 from app.database import db
+from app.utils.serializers import Serializer, Related
+
+PARCEL_STATUSES = ('pending', 'paid', 'postponed', 'cancelled', 'overdue')
 
 class Parcel(db.Model):
     __tablename__ = 'parcels'
+    __table_args__ = (
+        # Newest-first listing and keyset pagination, optionally by status or creator
+        db.Index('ix_parcels_created_at_id', 'created_at', 'id'),
+        db.Index('ix_parcels_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_parcels_user_id_created_at', 'user_id', 'created_at'),
+        # Paid revenue sums by updated_at, covering the amount
+        db.Index('ix_parcels_status_updated_at', 'status', 'updated_at', 'expected_amount'),
+        db.Index('ix_parcels_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     customer_name = db.Column(db.String(100), nullable=False)
@@ -23,19 +35,15 @@ class Parcel(db.Model):
     # One-to-One relationship
     postponed_order = db.relationship('PostponedOrder', backref='parcel', uselist=False, cascade="all, delete-orphan")
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'customer_name': self.customer_name,
-            'phone': self.phone,
-            'alt_phone': self.alt_phone,
-            'product': self.product,
-            'destination': self.destination,
-            'expected_amount': self.expected_amount,
-            'courier': self.courier,
-            'status': self.status,
-            'user_id': self.user_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'creator_name': self.creator.name if self.creator else "Unknown"
-        }
\ No newline at end of file
+    serializer = Serializer(
+        columns=(
+            'id', 'customer_name', 'phone', 'alt_phone', 'product', 'destination',
+            'expected_amount', 'courier', 'status', 'user_id', 'created_at', 'updated_at'
+        ),
+        related={'creator_name': Related('creator', 'name', default="Unknown")},
+        # created_at is the keyset pagination cursor
+        always=('id', 'created_at')
+    )
+
+    def to_dict(self, fields=None):
+        return self.serializer.dump(self, fields)
@@ -0,0 +1,14 @@
+from app.database import db
+
+class ParcelStatusCounter(db.Model):
+    __tablename__ = 'parcel_status_counters'
+
+    # One row per parcel status, kept current by app.services.status_service
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'status': self.status,
+            'count': self.count
+        }
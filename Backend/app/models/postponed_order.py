@@ -1,8 +1,12 @@
 from datetime import datetime
 from app.database import db
+from app.utils.serializers import Serializer, Related
 
 class PostponedOrder(db.Model):
     __tablename__ = 'postponed_orders'
+    __table_args__ = (
+        db.Index('ix_postponed_orders_queue', 'is_resolved', 'new_delivery_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     parcel_id = db.Column(db.Integer, db.ForeignKey('parcels.id'), unique=True, nullable=False)
@@ -11,13 +15,10 @@ class PostponedOrder(db.Model):
     is_resolved = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'parcel_id': self.parcel_id,
-            'parcel_details': self.parcel.to_dict() if self.parcel else None,
-            'new_delivery_date': self.new_delivery_date.isoformat() if self.new_delivery_date else None,
-            'notes': self.notes,
-            'is_resolved': self.is_resolved,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    serializer = Serializer(
+        columns=('id', 'parcel_id', 'new_delivery_date', 'notes', 'is_resolved', 'created_at'),
+        related={'parcel_details': Related('parcel', nested=True)}
+    )
+
+    def to_dict(self, fields=None):
+        return self.serializer.dump(self, fields)
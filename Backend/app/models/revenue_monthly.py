@@ -0,0 +1,16 @@
+from app.database import db
+
+class RevenueMonthly(db.Model):
+    __tablename__ = 'revenue_monthly'
+
+    # Paid parcel revenue rolled up by the month of parcels.updated_at ('YYYY-MM')
+    month = db.Column(db.String(7), primary_key=True)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    parcel_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'month': self.month,
+            'revenue': self.revenue,
+            'parcel_count': self.parcel_count
+        }
@@ -0,0 +1,14 @@
+from datetime import datetime
+from app.database import db
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+
+    # Append-only log read incrementally by id in every worker
+    # (see app.services.revocation_service); rows go once the token expires
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
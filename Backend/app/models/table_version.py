@@ -0,0 +1,11 @@
+from datetime import datetime
+from app.database import db
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    # One row per table, bumped in the same transaction as every write to it
+    # (see app.services.version_service); the HTTP validators are built from these
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.database import db
+from app.services.password_service import hash_password, needs_rehash, verify_password
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -12,15 +12,23 @@ class User(db.Model):
     role = db.Column(db.String(20), default='user')  # admin, user
     password_hash = db.Column(db.String(256), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Carried in issued tokens; bumping it invalidates them (role or password change)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     parcels = db.relationship('Parcel', backref='creator', lazy=True)
     expenses = db.relationship('Expense', backref='creator', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
+
+    def bump_token_version(self):
+        self.token_version = (self.token_version or 0) + 1
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
 
     def to_dict(self):
         return {
@@ -29,5 +37,5 @@ class User(db.Model):
             'email': self.email,
             'phone': self.phone,
             'role': self.role,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
\ No newline at end of file
@@ -0,0 +1,11 @@
+from datetime import datetime
+from app.database import db
+
+class Watermark(db.Model):
+    __tablename__ = 'watermarks'
+
+    # Progress markers for incremental jobs, e.g. how far the overdue scan
+    # has looked, or when a periodic job was last queued
+    name = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,13 +1,24 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from flask_jwt_extended import (
     create_access_token,
-    create_refresh_token,
+    decode_token,
     jwt_required,
+    get_jwt,
     get_jwt_identity
 )
 from app.models.user import User
+from app.services.auth_service import (
+    get_user_snapshot,
+    issue_tokens,
+    password_reset_token,
+    token_is_current,
+    user_for_reset_token
+)
+from app.services.email_service import send_email
+from app.services.revocation_service import revocation_store
 from app.utils import api_response, error_response
 from app.database import db
+from jwt.exceptions import PyJWTError
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -58,10 +69,18 @@ def login():
     password = data.get('password')
 
     user = User.query.filter_by(email=email).first()
+    # Hand the pooled connection back before the slow hash check; the
+    # loaded user stays usable detached
+    db.session.close()
 
     if user and user.check_password(password):
-        access_token = create_access_token(identity=str(user.id))
-        refresh_token = create_refresh_token(identity=str(user.id))
+        # Upgrade hashes made with an older algorithm or cost setting
+        if user.password_needs_rehash():
+            user = db.session.merge(user)
+            user.set_password(password)
+            db.session.commit()
+
+        access_token, refresh_token = issue_tokens(user)
 
         return api_response({
             "access_token": access_token,
@@ -78,7 +97,13 @@ def login():
 @jwt_required(refresh=True)
 def refresh():
     user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=str(user_id))
+    user = get_user_snapshot(user_id)
+    if not user or not token_is_current(user, get_jwt()):
+        return error_response("Refresh token is no longer valid", "AUTH_ERROR", 401)
+
+    # Re-read role and version so the new token reflects any role change
+    claims = {"role": user["role"], "ver": user["token_version"]}
+    new_access_token = create_access_token(identity=str(user_id), additional_claims=claims)
     return api_response({"access_token": new_access_token}, "Token refreshed")
 
 # -------------------------
@@ -87,13 +112,12 @@ def refresh():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def me():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user = get_user_snapshot(get_jwt_identity())
 
     if not user:
         return error_response("User not found", "NOT_FOUND", 404)
 
-    return api_response(user.to_dict())
+    return api_response(user["profile"])
 
 # -------------------------
 # Logout
@@ -101,5 +125,58 @@ def me():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    # If using token blocklist, revoke token here
-    return api_response(None, "Logged out successfully")
\ No newline at end of file
+    tokens = [get_jwt()]
+
+    # Optionally revoke the session's refresh token in the same call
+    refresh_token = (request.get_json(silent=True) or {}).get("refresh_token")
+    if refresh_token:
+        try:
+            refresh = decode_token(refresh_token)
+        except PyJWTError:
+            return error_response("Invalid refresh token", "VALIDATION_ERROR", 400)
+        if refresh.get("type") != "refresh" or refresh.get("sub") != get_jwt_identity():
+            return error_response("Invalid refresh token", "VALIDATION_ERROR", 400)
+        tokens.append(refresh)
+
+    revocation_store.revoke(*tokens)
+    return api_response(None, "Logged out successfully")
+
+# -------------------------
+# Forgot / reset password
+# -------------------------
+@auth_bp.route('/forgot-password', methods=['POST'])
+def forgot_password():
+    email = ((request.get_json(silent=True) or {}).get("email") or "").strip()
+    if not email:
+        return error_response("Email is required", "VALIDATION_ERROR", 400)
+
+    user = User.query.filter_by(email=email).first()
+    if user:
+        link = f"{current_app.config['FRONTEND_URL']}/reset-password?token={password_reset_token(user)}"
+        send_email(user.email, "Reset your Joyful Cargo password", (
+            f"Hi {user.name},\n\n"
+            f"Use this link to choose a new password:\n{link}\n\n"
+            "If you didn't ask for this, you can ignore this email."
+        ))
+        db.session.commit()
+
+    # Same answer either way, so this can't be used to probe for accounts
+    return api_response(None, "If an account exists for that email, a reset link has been sent")
+
+@auth_bp.route('/reset-password', methods=['POST'])
+def reset_password():
+    data = request.get_json(silent=True) or {}
+    token = data.get("token")
+    password = data.get("password")
+    if not token or not password:
+        return error_response("Token and password are required", "VALIDATION_ERROR", 400)
+
+    user = user_for_reset_token(token)
+    if user is None:
+        return error_response("Reset link is invalid or has expired", "INVALID_TOKEN", 400)
+
+    user.set_password(password)
+    # Sign out sessions that used the old password and spend the token
+    user.bump_token_version()
+    db.session.commit()
+    return api_response(None, "Password has been reset")
@@ -0,0 +1,35 @@
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from app.services.change_service import CHANGE_MODELS, CursorExpired, get_changes
+from app.utils import api_response, error_response
+
+change_bp = Blueprint('changes', __name__)
+
+MAX_LIMIT = 5000
+
+@change_bp.route('', methods=['GET'])
+@jwt_required()
+def list_changes():
+    """
+    Delta sync: rows created, updated or deleted after `since`.
+
+    Call without `since` after a full load to get a starting cursor, then
+    keep passing back `meta.next_cursor`; repeat while `meta.has_more`.
+    `entities` narrows the feed (e.g. `parcels,postponed_orders`).
+    """
+    limit = min(request.args.get('limit', 500, type=int), MAX_LIMIT)
+    entities = [e.strip() for e in request.args.get('entities', '').split(',') if e.strip()] or None
+    unknown = [e for e in entities or () if e not in CHANGE_MODELS]
+    if unknown:
+        return error_response(f"Unknown entities: {', '.join(unknown)}", "VALIDATION_ERROR")
+    if limit < 1:
+        return error_response("limit must be positive", "VALIDATION_ERROR")
+
+    try:
+        changes, next_cursor, has_more = get_changes(request.args.get('since'), limit, entities)
+    except CursorExpired as e:
+        return error_response(str(e), "CURSOR_EXPIRED", 410)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    return api_response(changes, meta={"next_cursor": next_cursor, "has_more": has_more, "limit": limit})
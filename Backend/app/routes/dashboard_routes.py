@@ -1,9 +1,9 @@
-from flask import Blueprint
+from flask import Blueprint, request
 from flask_jwt_extended import jwt_required
 from app.models import Parcel, PostponedOrder, Expense, ExpenseCategory
-from app.database import db
-from app.services.analytics_service import get_dashboard_overview, get_revenue_trend
+from app.services.analytics_service import get_dashboard_overview, get_dashboard_stats, get_revenue_trend
 from app.utils import api_response
+from app.utils.cache import analytics_cache
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -24,18 +24,19 @@ def overview():
 @dashboard_bp.route('/revenue-trend', methods=['GET'])
 @jwt_required()
 def revenue_trend():
-    data = get_revenue_trend()
+    months = min(max(request.args.get('months', 6, type=int), 1), 24)
+    data = get_revenue_trend(months)
     return api_response(data)
 
 # Optionally, you can add more aggregated endpoints if needed, e.g., parcel status stats
 @dashboard_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def stats():
-    stats_data = {
-        "total_parcels": Parcel.query.count(),
-        "pending_parcels": Parcel.query.filter_by(status="pending").count(),
-        "paid_parcels": Parcel.query.filter_by(status="paid").count(),
-        "overdue_parcels": Parcel.query.filter_by(status="overdue").count(),
-        "total_expenses": db.session.query(db.func.sum(Expense.amount)).scalar() or 0
-    }
-    return api_response(stats_data, "Dashboard stats")
+    return api_response(get_dashboard_stats(), "Dashboard stats")
+
+# Analytics cache hit/miss counters for the worker that answers; the totals
+# for all workers are analytics_cache_events_total in /metrics
+@dashboard_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+def cache_stats():
+    return api_response(analytics_cache.stats(), "Analytics cache stats for this worker")
@@ -0,0 +1,36 @@
+from flask import Blueprint, Response, request
+from flask_jwt_extended import jwt_required
+from app.services.live_service import TOPICS, live_feed
+from app.utils import error_response
+
+event_bp = Blueprint('events', __name__)
+
+@event_bp.route('', methods=['GET'])
+# EventSource can't set headers, so browsers pass the token as ?jwt=
+@jwt_required(locations=['headers', 'query_string'])
+def stream_events():
+    """
+    Server-Sent Events: `dashboard` (the numbers that changed) and
+    `parcel` (a parcel's status changed) as they happen.
+
+    `topics` narrows the stream (`dashboard`, `parcels`; both by default).
+    The first `dashboard` event carries every number, later ones only the
+    ones that changed.
+    """
+    topics = [t.strip() for t in request.args.get('topics', '').split(',') if t.strip()] or TOPICS
+    unknown = [t for t in topics if t not in TOPICS]
+    if unknown:
+        return error_response(f"Unknown topics: {', '.join(unknown)}", "VALIDATION_ERROR")
+
+    subscription = live_feed.subscribe(topics)
+    if subscription is None:
+        response, status = error_response("Too many open event streams, try again shortly", "BUSY", 503)
+        response.headers['Retry-After'] = '5'
+        return response, status
+
+    # No app context or database session is held while the stream is open
+    return Response(live_feed.stream(subscription), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Stop nginx from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
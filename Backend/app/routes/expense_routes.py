@@ -3,21 +3,73 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Expense, ExpenseCategory
 from app.database import db
 from app.utils import api_response, error_response
+from app.utils.conditional import conditional
+from app.utils.export import EXPORT_FORMATS, stream_export
+from app.utils.filters import filter_expenses, sort_expenses
+from app.utils.pagination import COUNT_MODES, count_total, page_limit, pages_for
 from datetime import datetime
 
 expense_bp = Blueprint('expenses', __name__)
 
 @expense_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional('expenses', 'expense_categories', 'users')
 def get_expenses():
-    expenses = Expense.query.all()
-    return api_response([e.to_dict() for e in expenses])
+    page = request.args.get('page', 1, type=int)
+    per_page = page_limit(request.args)
+    count_mode = request.args.get('count', 'exact')
+
+    if count_mode not in COUNT_MODES:
+        return error_response(f"count must be one of: {', '.join(COUNT_MODES)}", "VALIDATION_ERROR")
+
+    try:
+        fields = Expense.serializer.parse(request.args.get('fields'))
+        query = filter_expenses(Expense.query, request.args)
+        ordered = sort_expenses(query, request.args)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    pagination = ordered.options(*Expense.serializer.options(fields)).paginate(
+        page=page, per_page=per_page, error_out=False, count=False
+    )
+    total = count_total(query, count_mode)
+
+    meta = {
+        "page": page,
+        "pages": pages_for(total, per_page),
+        "total": total,
+        "limit": per_page
+    }
+
+    return api_response([e.to_dict(fields) for e in pagination.items], meta=meta)
+
+@expense_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_expenses():
+    # Same filters and sort options as the list view, streamed as CSV or NDJSON
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return error_response(f"format must be one of: {', '.join(EXPORT_FORMATS)}", "VALIDATION_ERROR")
+
+    try:
+        fields = Expense.serializer.parse(request.args.get('fields'))
+        query = sort_expenses(filter_expenses(Expense.query, request.args), request.args)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    return stream_export(query, Expense.serializer, fields, fmt, 'expenses')
 
 @expense_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
+@conditional('expenses', 'expense_categories', 'users')
 def get_expense(id):
-    expense = Expense.query.get_or_404(id)
-    return api_response(expense.to_dict())
+    try:
+        fields = Expense.serializer.parse(request.args.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    expense = Expense.query.options(*Expense.serializer.options(fields)).get_or_404(id)
+    return api_response(expense.to_dict(fields))
 
 @expense_bp.route('', methods=['POST'])
 @jwt_required()
@@ -0,0 +1,37 @@
+import os
+
+from flask import Blueprint, Response, current_app, jsonify
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import db, pool_status
+from app.utils.metrics import metrics
+
+health_bp = Blueprint('health', __name__)
+
+# Readiness probe for the load balancer: 503 until the database answers
+@health_bp.route('/health', methods=['GET'])
+def health_check():
+    try:
+        db.session.execute(text("SELECT 1"))
+        database = "ok"
+    except SQLAlchemyError as e:
+        current_app.logger.warning("Health check database error: %s", e)
+        database = "unavailable"
+    finally:
+        db.session.rollback()
+
+    pool = pool_status()
+    pool["max_overflow"] = current_app.config['DB_MAX_OVERFLOW']
+
+    healthy = database == "ok"
+    return jsonify({
+        "status": "healthy" if healthy else "unhealthy",
+        "database": database,
+        "worker_pid": os.getpid(),
+        "pool": pool
+    }), 200 if healthy else 503
+
+# Prometheus scrape target, summed over every worker writing to METRICS_DIR
+@health_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -1,45 +1,116 @@
 from flask import Blueprint, request
 from app.models import Parcel, PostponedOrder
+from app.models.parcel import PARCEL_STATUSES
 from app.database import db
 from app.utils import api_response, error_response
+from app.services.bulk_service import bulk_update_status
+from app.services.import_service import import_parcels, iter_csv_rows, iter_json_array, iter_ndjson_rows
+from app.services.search_service import search_parcels
+from app.services.status_service import get_parcel_status_counts
+from app.utils.conditional import conditional
+from app.utils.export import EXPORT_FORMATS, stream_export
+from app.utils.filters import filter_parcels
+from app.utils.pagination import COUNT_MODES, count_total, keyset_paginate, page_limit, pages_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
+import csv
+
+IMPORT_FORMATS_BY_MIMETYPE = {
+    'text/csv': 'csv',
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson'
+}
 
 parcel_bp = Blueprint('parcels', __name__)
 
 @parcel_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional('parcels', 'users')
 def get_parcels():
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('limit', 20, type=int)
-    status = request.args.get('status')
+    per_page = page_limit(request.args)
     search = request.args.get('search')
+    # Passing `cursor` (empty for the first page) switches to keyset pagination
+    cursor = request.args.get('cursor')
+    count_mode = request.args.get('count', 'exact' if cursor is None else 'none')
+
+    if count_mode not in COUNT_MODES:
+        return error_response(f"count must be one of: {', '.join(COUNT_MODES)}", "VALIDATION_ERROR")
 
-    query = Parcel.query
+    try:
+        fields = Parcel.serializer.parse(request.args.get('fields'))
+        query = filter_parcels(Parcel.query.options(*Parcel.serializer.options(fields)), request.args)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
 
-    if status:
-        query = query.filter(Parcel.status == status)
+    rank = None
     if search:
-        query = query.filter(Parcel.customer_name.ilike(f'%{search}%') | Parcel.phone.ilike(f'%{search}%'))
-        
-    query = query.order_by(Parcel.created_at.desc())
-    
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    
+        query, rank = search_parcels(query, search)
+
+    # Cursor mode keeps newest-first order; only page mode orders by relevance
+    if cursor is not None:
+        try:
+            items, next_cursor = keyset_paginate(query, Parcel, cursor, per_page)
+        except ValueError as e:
+            return error_response(str(e), "VALIDATION_ERROR")
+
+        meta = {
+            "limit": per_page,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "total": count_total(query, count_mode)
+        }
+        return api_response([p.to_dict(fields) for p in items], meta=meta)
+
+    if rank is not None:
+        query = query.order_by(rank, Parcel.created_at.desc())
+    else:
+        query = query.order_by(Parcel.created_at.desc())
+
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    total = count_total(query, count_mode)
+
     meta = {
         "page": page,
-        "pages": pagination.pages,
-        "total": pagination.total,
+        "pages": pages_for(total, per_page),
+        "total": total,
         "limit": per_page
     }
-    
-    return api_response([p.to_dict() for p in pagination.items], meta=meta)
+
+    return api_response([p.to_dict(fields) for p in pagination.items], meta=meta)
+
+@parcel_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_parcels():
+    # Same filters as the list view, streamed newest first as CSV or NDJSON
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return error_response(f"format must be one of: {', '.join(EXPORT_FORMATS)}", "VALIDATION_ERROR")
+
+    try:
+        fields = Parcel.serializer.parse(request.args.get('fields'))
+        query = filter_parcels(Parcel.query, request.args)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    search = request.args.get('search')
+    if search:
+        query, _ = search_parcels(query, search)
+
+    query = query.order_by(Parcel.created_at.desc(), Parcel.id.desc())
+    return stream_export(query, Parcel.serializer, fields, fmt, 'parcels')
 
 @parcel_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
+@conditional('parcels', 'users')
 def get_parcel(id):
-    parcel = Parcel.query.get_or_404(id)
-    return api_response(parcel.to_dict())
+    try:
+        fields = Parcel.serializer.parse(request.args.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    parcel = Parcel.query.options(*Parcel.serializer.options(fields)).get_or_404(id)
+    return api_response(parcel.to_dict(fields))
 
 @parcel_bp.route('', methods=['POST'])
 @jwt_required()
@@ -63,6 +134,40 @@ def create_parcel():
     db.session.commit()
     return api_response(new_parcel.to_dict(), status=201)
 
+@parcel_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_parcels_route():
+    """
+    Bulk import parcels from CSV (header row), a JSON array or NDJSON.
+
+    The body is parsed as it streams in; a multipart upload in a `file`
+    field is also accepted. Pass ?dry_run=true to only validate.
+    """
+    user_id = get_jwt_identity()
+    dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream = upload.stream
+        fmt = request.args.get('format') or upload.filename.rsplit('.', 1)[-1].lower()
+    else:
+        stream = request.stream
+        fmt = request.args.get('format') or IMPORT_FORMATS_BY_MIMETYPE.get(request.mimetype)
+
+    readers = {'csv': iter_csv_rows, 'json': iter_json_array, 'ndjson': iter_ndjson_rows}
+    if fmt not in readers:
+        return error_response("Send CSV, a JSON array or NDJSON", "UNSUPPORTED_FORMAT", 415)
+
+    try:
+        summary = import_parcels(readers[fmt](stream), int(user_id), dry_run=dry_run)
+    except (ValueError, csv.Error, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return error_response(f"Could not parse {fmt} body: {e}", "PARSE_ERROR", 400)
+
+    db.session.commit()
+    message = "Import validated" if dry_run else "Import completed"
+    return api_response(summary, message, status=200 if dry_run else 201)
+
 @parcel_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_parcel(id):
@@ -110,6 +215,44 @@ def update_status(id):
     db.session.commit()
     return api_response(parcel.to_dict(), "Status updated")
 
+@parcel_bp.route('/status', methods=['PATCH'])
+@jwt_required()
+def bulk_update_status_route():
+    """
+    Change the status of many parcels at once.
+
+    Body: {"status": ..., "ids": [...]} or {"status": ..., "filter": {...}}
+    where the filter takes the same keys as the list view (status,
+    user_id, created_from, created_to).
+    """
+    data = request.get_json() or {}
+    new_status = data.get('status')
+    ids = data.get('ids')
+    filters = data.get('filter')
+
+    if new_status not in PARCEL_STATUSES:
+        return error_response(f"status must be one of: {', '.join(PARCEL_STATUSES)}", "VALIDATION_ERROR")
+    if bool(ids) == bool(filters):
+        return error_response("Provide either a non-empty ids list or a filter", "VALIDATION_ERROR")
+
+    if ids:
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return error_response("ids must be a list of integers", "VALIDATION_ERROR")
+        criteria = [Parcel.id.in_(ids)]
+    else:
+        if not isinstance(filters, dict):
+            return error_response("filter must be an object", "VALIDATION_ERROR")
+        try:
+            criteria = [filter_parcels(Parcel.query, filters).whereclause]
+        except ValueError as e:
+            return error_response(str(e), "VALIDATION_ERROR")
+        if criteria[0] is None:
+            return error_response("filter must narrow the selection", "VALIDATION_ERROR")
+
+    summary = bulk_update_status(criteria, new_status, notes=data.get('notes', 'Postponed in bulk'))
+    db.session.commit()
+    return api_response(summary, "Statuses updated")
+
 @parcel_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_parcel(id):
@@ -120,17 +263,23 @@ def delete_parcel(id):
 
 @parcel_bp.route('/overdue', methods=['GET'])
 @jwt_required()
+@conditional('parcels', 'users')
 def get_overdue():
-    parcels = Parcel.query.filter_by(status='overdue').all()
-    return api_response([p.to_dict() for p in parcels])
+    try:
+        fields = Parcel.serializer.parse(request.args.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    parcels = Parcel.query.options(*Parcel.serializer.options(fields)).filter_by(status='overdue').all()
+    return api_response([p.to_dict(fields) for p in parcels])
 
 @parcel_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_stats():
-    # Simple stats
+    counts = get_parcel_status_counts()
     stats = {
-        "pending": Parcel.query.filter_by(status='pending').count(),
-        "paid": Parcel.query.filter_by(status='paid').count(),
-        "cancelled": Parcel.query.filter_by(status='cancelled').count()
+        "pending": counts['pending'],
+        "paid": counts['paid'],
+        "cancelled": counts['cancelled']
     }
     return api_response(stats)
\ No newline at end of file
@@ -1,7 +1,11 @@
 from flask import Blueprint, request
 from app.models import PostponedOrder, Parcel
 from app.database import db
+from app.services.status_service import get_postponed_counts
 from app.utils import api_response, error_response
+from app.utils.conditional import conditional
+from app.utils.filters import filter_postponed
+from app.utils.pagination import COUNT_MODES, count_total, page_limit, pages_for
 from flask_jwt_extended import jwt_required
 from datetime import datetime
 
@@ -9,15 +13,48 @@ postponed_bp = Blueprint('postponed', __name__)
 
 @postponed_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional('postponed_orders', 'parcels', 'users', daily=True)
 def get_all_postponed():
-    orders = PostponedOrder.query.filter_by(is_resolved=False).all()
-    return api_response([o.to_dict() for o in orders])
+    page = request.args.get('page', 1, type=int)
+    per_page = page_limit(request.args)
+    count_mode = request.args.get('count', 'exact')
+
+    if count_mode not in COUNT_MODES:
+        return error_response(f"count must be one of: {', '.join(COUNT_MODES)}", "VALIDATION_ERROR")
+
+    try:
+        fields = PostponedOrder.serializer.parse(request.args.get('fields'))
+        query = filter_postponed(PostponedOrder.query.filter(PostponedOrder.is_resolved.is_(False)), request.args)
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    # Soonest delivery first, unscheduled orders last; served by ix_postponed_orders_queue
+    ordered = query.order_by(PostponedOrder.new_delivery_date.asc().nulls_last(), PostponedOrder.id.asc())
+    pagination = ordered.options(*PostponedOrder.serializer.options(fields)).paginate(
+        page=page, per_page=per_page, error_out=False, count=False
+    )
+    total = count_total(query, count_mode)
+
+    meta = {
+        "page": page,
+        "pages": pages_for(total, per_page),
+        "total": total,
+        "limit": per_page
+    }
+
+    return api_response([o.to_dict(fields) for o in pagination.items], meta=meta)
 
 @postponed_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
+@conditional('postponed_orders', 'parcels', 'users')
 def get_postponed(id):
-    order = PostponedOrder.query.get_or_404(id)
-    return api_response(order.to_dict())
+    try:
+        fields = PostponedOrder.serializer.parse(request.args.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), "VALIDATION_ERROR")
+
+    order = PostponedOrder.query.options(*PostponedOrder.serializer.options(fields)).get_or_404(id)
+    return api_response(order.to_dict(fields))
 
 @postponed_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
@@ -48,5 +85,4 @@ def resolve_order(id):
 @postponed_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def stats():
-    count = PostponedOrder.query.filter_by(is_resolved=False).count()
-    return api_response({"active_postponed": count})
\ No newline at end of file
+    return api_response(get_postponed_counts())
\ No newline at end of file
@@ -58,6 +58,8 @@ def update_user(id):
     
     if 'password' in data and data['password']:
          user.set_password(data['password'])
+         # Sign out sessions that used the old password
+         user.bump_token_version()
 
     db.session.commit()
     return api_response(user.to_dict(), "User updated")
@@ -67,7 +69,11 @@ def update_user(id):
 def update_role(id):
     user = User.query.get_or_404(id)
     data = request.get_json()
-    user.role = data.get('role', user.role)
+    role = data.get('role', user.role)
+    if role != user.role:
+        user.role = role
+        # Tokens carry the role claim; make the old ones stop working
+        user.bump_token_version()
     db.session.commit()
     return api_response(user.to_dict(), "Role updated")
 
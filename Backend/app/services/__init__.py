@@ -1,3 +1,5 @@
 # Expose services for easier imports
-from .analytics_service import get_dashboard_overview, get_revenue_trend
+from .analytics_service import get_dashboard_overview, get_revenue_trend, rebuild_revenue_rollup
 from .email_service import send_email
+from .search_service import search_parcels, rebuild_search_index
+from .status_service import get_parcel_status_counts, get_postponed_counts, rebuild_status_counters
@@ -1,47 +1,171 @@
-from sqlalchemy import func, extract
+from collections import defaultdict
+from sqlalchemy import case, event, func, extract, inspect, insert, update
 from datetime import datetime, timedelta
 from app.database import db
-from app.models import Parcel, Expense
+from app.models import Parcel, Expense, RevenueMonthly
+from app.services.status_service import get_parcel_status_counts
+from app.utils.cache import analytics_cache
 
-def get_dashboard_overview():
+# Writes to these models change the dashboard numbers
+ANALYTICS_MODELS = (Parcel, Expense)
+
+def compute_dashboard_overview():
+    """The dashboard overview, always from the database; see get_dashboard_overview."""
     today = datetime.utcnow().date()
     start_of_month = datetime(today.year, today.month, 1)
     
-    # Total Revenue (Paid parcels)
-    total_revenue = db.session.query(func.sum(Parcel.expected_amount)).filter(
-        Parcel.status == 'paid'
-    ).scalar() or 0
-
-    # Current Month Revenue
-    month_revenue = db.session.query(func.sum(Parcel.expected_amount)).filter(
-        Parcel.status == 'paid',
-        Parcel.updated_at >= start_of_month
-    ).scalar() or 0
+    # Total and current month revenue (paid parcels) in one pass
+    total_revenue, month_revenue = db.session.query(
+        func.sum(Parcel.expected_amount),
+        func.sum(case((Parcel.updated_at >= start_of_month, Parcel.expected_amount), else_=0))
+    ).filter(Parcel.status == 'paid').one()
 
-    # Active Parcels
-    active_parcels = Parcel.query.filter(Parcel.status.in_(['pending', 'postponed'])).count()
+    counts = get_parcel_status_counts()
 
-    # Overdue
-    overdue_parcels = Parcel.query.filter_by(status='overdue').count()
+    return {
+        "total_revenue": total_revenue or 0,
+        "month_revenue": month_revenue or 0,
+        "active_parcels": counts['pending'] + counts['postponed'],
+        "overdue_parcels": counts['overdue']
+    }
 
+def compute_dashboard_stats():
+    """The dashboard stats, always from the database; see get_dashboard_stats."""
+    counts = get_parcel_status_counts()
     return {
-        "total_revenue": total_revenue,
-        "month_revenue": month_revenue,
-        "active_parcels": active_parcels,
-        "overdue_parcels": overdue_parcels
+        "total_parcels": sum(counts.values()),
+        "pending_parcels": counts["pending"],
+        "paid_parcels": counts["paid"],
+        "overdue_parcels": counts["overdue"],
+        "total_expenses": db.session.query(func.sum(Expense.amount)).scalar() or 0
     }
 
-def get_revenue_trend():
-    # Last 6 months
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=180)
-    
-    results = db.session.query(
-        func.to_char(Parcel.updated_at, 'YYYY-MM').label('month'),
-        func.sum(Parcel.expected_amount)
-    ).filter(
-        Parcel.status == 'paid',
-        Parcel.updated_at >= start_date
-    ).group_by('month').order_by('month').all()
-    
-    return [{"month": r[0], "revenue": r[1]} for r in results]
\ No newline at end of file
+@analytics_cache.cached('dashboard_overview')
+def get_dashboard_overview():
+    return compute_dashboard_overview()
+
+@analytics_cache.cached('dashboard_stats')
+def get_dashboard_stats():
+    return compute_dashboard_stats()
+
+@analytics_cache.cached('revenue_trend')
+def get_revenue_trend(months=6):
+    # Read the last `months` rows of the revenue_monthly rollup
+    today = datetime.utcnow().date()
+    year, month = today.year, today.month - (months - 1)
+    while month < 1:
+        year, month = year - 1, month + 12
+    start_month = f"{year:04d}-{month:02d}"
+
+    results = RevenueMonthly.query.filter(
+        RevenueMonthly.month >= start_month,
+        RevenueMonthly.parcel_count > 0
+    ).order_by(RevenueMonthly.month).all()
+
+    return [{"month": r.month, "revenue": round(r.revenue, 2)} for r in results]
+
+
+def _month_of(value):
+    return value.strftime('%Y-%m') if value else None
+
+
+def month_expr(column, dialect_name):
+    """SQL expression formatting `column` as 'YYYY-MM' on the given dialect."""
+    if dialect_name == 'sqlite':
+        return func.strftime('%Y-%m', column)
+    if dialect_name in ('mysql', 'mariadb'):
+        return func.date_format(column, '%Y-%m')
+    return func.to_char(column, 'YYYY-MM')
+
+
+def rebuild_revenue_rollup():
+    """Backfill revenue_monthly from every paid parcel."""
+    month = month_expr(Parcel.updated_at, db.session.get_bind().dialect.name).label('month')
+    rows = db.session.query(
+        month, func.sum(Parcel.expected_amount), func.count(Parcel.id)
+    ).filter(Parcel.status == 'paid').group_by(month).all()
+
+    db.session.query(RevenueMonthly).delete()
+    db.session.add_all([
+        RevenueMonthly(month=m, revenue=revenue or 0, parcel_count=count)
+        for m, revenue, count in rows
+    ])
+    db.session.commit()
+    return len(rows)
+
+
+def apply_revenue_deltas(connection, deltas):
+    """Add {month: (revenue, parcel_count)} deltas to the rollup in the caller's transaction."""
+    for month, (revenue, count) in deltas.items():
+        if month is None or (not revenue and not count):
+            continue
+        result = connection.execute(
+            update(RevenueMonthly)
+            .where(RevenueMonthly.month == month)
+            .values(
+                revenue=RevenueMonthly.revenue + revenue,
+                parcel_count=RevenueMonthly.parcel_count + count
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(RevenueMonthly).values(month=month, revenue=revenue, parcel_count=count)
+            )
+
+
+def _committed(parcel, attr):
+    history = inspect(parcel).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+@event.listens_for(db.session, 'before_flush')
+def _snapshot_paid_parcels(session, flush_context, instances):
+    # updated_at is rewritten during the flush, so remember what each paid
+    # parcel contributed to the rollup before it changes
+    snapshot = session.info.setdefault('revenue_snapshot', {})
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Parcel) and obj not in snapshot and _committed(obj, 'status') == 'paid':
+            snapshot[obj] = (_month_of(_committed(obj, 'updated_at')), _committed(obj, 'expected_amount') or 0)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _update_revenue_rollup(session, flush_context):
+    snapshot = session.info.pop('revenue_snapshot', {})
+    deltas = defaultdict(lambda: [0.0, 0])
+
+    for obj, (month, amount) in snapshot.items():
+        deltas[month][0] -= amount
+        deltas[month][1] -= 1
+
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Parcel) and obj not in session.deleted and obj.status == 'paid':
+            month = _month_of(obj.updated_at)
+            deltas[month][0] += obj.expected_amount or 0
+            deltas[month][1] += 1
+
+    if deltas:
+        apply_revenue_deltas(session.connection(), {m: tuple(d) for m, d in deltas.items()})
+
+
+@event.listens_for(db.session, 'after_flush')
+def _mark_analytics_dirty(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ANALYTICS_MODELS):
+            session.info['analytics_dirty'] = True
+            return
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_analytics(session):
+    if session.info.pop('analytics_dirty', False):
+        analytics_cache.invalidate()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_analytics_dirty(session):
+    session.info.pop('analytics_dirty', None)
+    session.info.pop('revenue_snapshot', None)
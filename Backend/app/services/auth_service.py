@@ -0,0 +1,89 @@
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import event
+from app.database import db
+from app.models import User
+from app.utils.cache import LRUCache
+
+# user id -> snapshot of the fields the auth checks and /me need
+user_cache = LRUCache()
+
+
+def init_user_cache(app):
+    user_cache.maxsize = app.config.get('USER_CACHE_SIZE', 1024)
+    user_cache.ttl = app.config.get('USER_CACHE_TTL', 60)
+    user_cache.clear()
+
+
+def token_claims(user):
+    return {"role": user.role, "ver": user.token_version or 0}
+
+
+def issue_tokens(user):
+    """Access and refresh tokens carrying the user's role and token version."""
+    claims = token_claims(user)
+    return (
+        create_access_token(identity=str(user.id), additional_claims=claims),
+        create_refresh_token(identity=str(user.id), additional_claims=claims)
+    )
+
+
+def _reset_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='password-reset')
+
+
+def password_reset_token(user):
+    """Signed token for the reset link; stops working once the password changes."""
+    return _reset_serializer().dumps({"id": user.id, "ver": user.token_version or 0})
+
+
+def user_for_reset_token(token):
+    """The user a still-valid reset token was issued to, else None."""
+    try:
+        data = _reset_serializer().loads(token, max_age=current_app.config.get('PASSWORD_RESET_MAX_AGE', 3600))
+    except BadSignature:
+        return None
+    user = db.session.get(User, data.get("id"))
+    # Resetting bumps the version, so each token works once
+    if user is None or (user.token_version or 0) != data.get("ver"):
+        return None
+    return user
+
+
+def _snapshot(user):
+    # Plain data, not the ORM instance, so it can outlive the session
+    return {"profile": user.to_dict(), "role": user.role, "token_version": user.token_version or 0}
+
+
+def get_user_snapshot(user_id):
+    """Cached snapshot for `user_id`, loading it on a miss; None if no such user."""
+    user_id = int(user_id)
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = _snapshot(user)
+        user_cache.set(user_id, snapshot)
+    return snapshot
+
+
+def token_is_current(snapshot, claims):
+    """False once the user's role or password changed after the token was issued."""
+    # Tokens issued before versioning carry no `ver`; fall back to the role check alone
+    return claims.get("ver", snapshot["token_version"]) == snapshot["token_version"]
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changed_users(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            session.info.setdefault('changed_users', set()).add(obj.id)
+
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop('changed_users', ()):
+        user_cache.delete(user_id)
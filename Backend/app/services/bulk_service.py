@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import and_, exists, func, insert, literal, select
+from app.database import db
+from app.models import Parcel, PostponedOrder
+from app.services.analytics_service import apply_revenue_deltas, month_expr
+from app.services.change_service import record_changes
+from app.services.status_service import apply_status_deltas, counters_enabled
+from app.services.version_service import bump_versions
+
+
+def bulk_update_status(criteria, new_status, notes="Postponed in bulk"):
+    """
+    Move every parcel matching `criteria` to `new_status` with set-based SQL.
+
+    `criteria` is a list of WHERE clauses on Parcel. Rows already in
+    `new_status` are left alone. Counters, the revenue rollup and the
+    postponed orders are updated in the same transaction; nothing is
+    committed here.
+    """
+    now = datetime.utcnow()
+    selection = and_(*criteria, Parcel.status != new_status)
+    connection = db.session.connection()
+
+    # Aggregate what is about to change before the UPDATE overwrites it
+    previous = dict(db.session.query(
+        Parcel.status, func.count(Parcel.id)
+    ).filter(selection).group_by(Parcel.status).all())
+    matched = sum(previous.values())
+    if not matched:
+        return {"status": new_status, "updated": 0, "previous_status": {}, "postponed_orders_created": 0}
+
+    revenue = {}
+    if previous.get('paid'):
+        month = month_expr(Parcel.updated_at, connection.dialect.name).label('month')
+        for m, amount, count in db.session.query(
+            month, func.sum(Parcel.expected_amount), func.count(Parcel.id)
+        ).filter(selection, Parcel.status == 'paid').group_by(month):
+            revenue[m] = (-(amount or 0), -count)
+    if new_status == 'paid':
+        amount = db.session.query(func.sum(Parcel.expected_amount)).filter(selection).scalar() or 0
+        current = now.strftime('%Y-%m')
+        old_amount, old_count = revenue.get(current, (0, 0))
+        revenue[current] = (old_amount + amount, old_count + matched)
+
+    # For the change log; the selection stops matching once updated
+    record_changes(db.session, 'parcels', db.session.execute(select(Parcel.id).where(selection)).scalars(), 'update')
+
+    created = 0
+    if new_status == 'postponed':
+        missing = select(
+            Parcel.id, literal(notes), literal(False), literal(now)
+        ).where(selection, ~exists().where(PostponedOrder.parcel_id == Parcel.id))
+        order_ids = connection.execute(
+            insert(PostponedOrder).from_select(
+                ['parcel_id', 'notes', 'is_resolved', 'created_at'], missing
+            ).returning(PostponedOrder.id)
+        ).scalars().all()
+        record_changes(db.session, 'postponed_orders', order_ids, 'insert')
+        created = len(order_ids)
+
+    updated = db.session.query(Parcel).filter(selection).update(
+        {Parcel.status: new_status, Parcel.updated_at: now}, synchronize_session=False
+    )
+
+    if counters_enabled():
+        deltas = {status: -count for status, count in previous.items()}
+        deltas[new_status] = deltas.get(new_status, 0) + matched
+        apply_status_deltas(connection, deltas)
+    if revenue:
+        apply_revenue_deltas(connection, revenue)
+    bump_versions(connection, ('parcels', 'postponed_orders') if created else ('parcels',))
+    db.session.info['analytics_dirty'] = True
+
+    return {
+        "status": new_status,
+        "updated": updated,
+        "previous_status": previous,
+        "postponed_orders_created": created
+    }
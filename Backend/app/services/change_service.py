@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, event, insert, select
+from app.database import db
+from app.models import Change, Expense, Parcel, PostponedOrder
+from app.services.job_service import job_handler, periodic
+from app.services.watermark_service import get_watermark, set_watermark
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# entity name (the table name) -> model, for the tables the feed covers
+CHANGE_MODELS = {model.__tablename__: model for model in (Parcel, Expense, PostponedOrder)}
+PRUNED_WATERMARK = 'changes:pruned_before'
+
+
+class CursorExpired(ValueError):
+    """The cursor points at changes that were already pruned."""
+
+
+def record_changes(session, entity, ids, op):
+    """
+    Note writes made outside the ORM (Core bulk statements) for the change log.
+
+    They are written with the ORM ones just before the session commits.
+    """
+    pending = session.info.setdefault('changes', {})
+    for entity_id in ids:
+        key = (entity, entity_id)
+        # A row inserted in this transaction stays an insert for the feed
+        if pending.get(key) == 'insert' and op == 'update':
+            continue
+        pending.pop(key, None)
+        pending[key] = op
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changes(session, flush_context):
+    for op, objects in (('insert', session.new), ('delete', session.deleted), ('update', session.dirty)):
+        for obj in objects:
+            entity = getattr(obj, '__tablename__', None)
+            if entity not in CHANGE_MODELS:
+                continue
+            if op == 'update' and not session.is_modified(obj, include_collections=False):
+                continue
+            record_changes(session, entity, [obj.id], op)
+
+
+@event.listens_for(db.session, 'before_commit')
+def _write_changes(session):
+    # Flush first so the last batch of ORM writes is collected too
+    session.flush()
+    pending = session.info.pop('changes', None)
+    if not pending:
+        return
+    # Written as late as possible: ids are handed out close to the commit,
+    # which keeps them in near commit order for readers of the feed
+    now = datetime.utcnow()
+    session.execute(insert(Change), [
+        {'entity': entity, 'entity_id': entity_id, 'op': op, 'changed_at': now}
+        for (entity, entity_id), op in pending.items()
+    ])
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('changes', None)
+
+
+def _committed_prefix(rows, after_id, gap_cutoff):
+    """
+    The (id, changed_at) rows up to the first id gap an open transaction may still fill.
+
+    Ids are taken just before COMMIT, so a missing id usually belongs to a
+    transaction that hasn't finished committing yet. The rows after it are
+    held back until it shows up. If the next row is older than
+    `gap_cutoff`, the id is taken to be lost to a rollback.
+    """
+    expected = after_id + 1 if after_id else None
+    for i, row in enumerate(rows):
+        if expected is not None and row.id != expected and row.changed_at > gap_cutoff:
+            return rows[:i]
+        expected = row.id + 1
+    return rows
+
+
+def _gap_cutoff():
+    return datetime.utcnow() - timedelta(seconds=current_app.config.get('CHANGES_GAP_SECONDS', 60))
+
+
+def _head_cursor(gap_cutoff):
+    # Everything older than the cutoff counts as committed; after that, stop
+    # at the first id still missing
+    base = db.session.execute(
+        select(Change.id, Change.changed_at).where(Change.changed_at <= gap_cutoff)
+        .order_by(Change.id.desc()).limit(1)
+    ).first()
+    base_id = base.id if base else 0
+    recent = db.session.execute(
+        select(Change.id, Change.changed_at).where(Change.id > base_id).order_by(Change.id)
+    ).all()
+    committed = _committed_prefix(recent, base_id, gap_cutoff)
+    last = committed[-1] if committed else base
+    return encode_cursor(last.changed_at, last.id) if last else encode_cursor(gap_cutoff, 0)
+
+
+def get_changes(since=None, limit=500, entities=None):
+    """
+    Rows changed after `since`, as (changes, next_cursor, has_more).
+
+    Each change is {"entity", "id", "op", "data"}, one per row in order of
+    its latest change, with the row's current serialized data (None for
+    deletes). Without `since` there are no changes, just the cursor to
+    start syncing from after a full load.
+
+    A transaction that takes its ids just before a faster one may commit
+    after it. The cursor therefore never moves past a missing id until
+    CHANGES_GAP_SECONDS have passed. After that the id is assumed lost to
+    a rollback, so a commit that takes longer than that can still be
+    skipped.
+    """
+    gap_cutoff = _gap_cutoff()
+    if since is None:
+        return [], _head_cursor(gap_cutoff), False
+
+    since_at, since_id = decode_cursor(since)
+    pruned_before = get_watermark(PRUNED_WATERMARK)
+    if pruned_before and since_at < pruned_before:
+        raise CursorExpired("Cursor has expired; reload and start from a new cursor")
+
+    # Gaps are found on every entity's ids, before the filter hides some of them
+    window = db.session.execute(
+        select(Change.id, Change.changed_at).where(Change.id > since_id).order_by(Change.id).limit(limit + 1)
+    ).all()
+    has_more = len(window) > limit
+    committed = _committed_prefix(window[:limit], since_id, gap_cutoff)
+    if len(committed) < len(window[:limit]):
+        has_more = False
+    if not committed:
+        return [], since, False
+    upper = committed[-1]
+
+    query = select(Change).where(Change.id > since_id, Change.id <= upper.id)
+    if entities:
+        query = query.where(Change.entity.in_(entities))
+    rows = db.session.execute(query.order_by(Change.id)).scalars().all()
+    next_cursor = encode_cursor(upper.changed_at, upper.id)
+
+    latest = {}
+    for row in rows:
+        # Keep each row once, at the position of its latest change
+        latest.pop((row.entity, row.entity_id), None)
+        latest[(row.entity, row.entity_id)] = row.op
+
+    current = {}
+    for entity, model in CHANGE_MODELS.items():
+        ids = [entity_id for (name, entity_id), op in latest.items() if name == entity and op != 'delete']
+        if ids:
+            objects = model.query.options(*model.serializer.options()).filter(model.id.in_(ids)).all()
+            current.update({(entity, obj.id): obj.to_dict() for obj in objects})
+
+    changes = []
+    for (entity, entity_id), op in latest.items():
+        data = current.get((entity, entity_id))
+        # Deleted after this page's change; the delete shows up on a later page
+        if data is None:
+            op = 'delete'
+        changes.append({"entity": entity, "id": entity_id, "op": op, "data": data})
+
+    return changes, next_cursor, has_more
+
+
+def prune_changes(now=None):
+    """Delete changes older than CHANGES_RETENTION_DAYS; cursors from before that expire."""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=current_app.config.get('CHANGES_RETENTION_DAYS', 7))
+    deleted = db.session.execute(delete(Change).where(Change.changed_at < cutoff)).rowcount
+    set_watermark(PRUNED_WATERMARK, cutoff)
+    db.session.commit()
+    return deleted
+
+
+@periodic('prune_changes', 'CHANGES_PRUNE_INTERVAL_SECONDS')
+@job_handler('prune_changes')
+def _prune_changes_job(payload):
+    prune_changes()
@@ -1,5 +1,58 @@
+import smtplib
+from email.message import EmailMessage
+
+from flask import current_app
+from app.services.job_service import enqueue, job_handler
+
+# Messages "sent" with MAIL_BACKEND=memory, for tests
+outbox = []
+
+
 def send_email(to, subject, body):
-    # Implementation for SMTP or SendGrid/Mailgun
-    # This is a mock function for production readiness structure
-    print(f"Sending email to {to}: {subject}")
-    return True
\ No newline at end of file
+    """
+    Queue an email; a job worker (`flask run-jobs`) delivers it.
+
+    Only adds a row to the caller's session, so it costs nothing on the
+    request path and is sent only if the caller commits.
+    """
+    return enqueue('email', {"to": to, "subject": subject, "body": body})
+
+
+def _message(payload, sender):
+    message = EmailMessage()
+    message['From'] = sender
+    message['To'] = payload['to']
+    message['Subject'] = payload['subject']
+    message.set_content(payload['body'])
+    return message
+
+
+@job_handler('email', batch=True)
+def deliver_emails(payloads):
+    """Send a batch of queued emails over one connection; one error or None per message."""
+    config = current_app.config
+    backend = config.get('MAIL_BACKEND', 'console')
+    messages = [_message(p, config.get('MAIL_FROM')) for p in payloads]
+
+    if backend == 'memory':
+        outbox.extend(messages)
+        return [None] * len(messages)
+    if backend == 'console':
+        for message in messages:
+            current_app.logger.info("Email to %s: %s", message['To'], message['Subject'])
+        return [None] * len(messages)
+
+    errors = []
+    with smtplib.SMTP(config['MAIL_SERVER'], config.get('MAIL_PORT', 25), timeout=config.get('MAIL_TIMEOUT', 10)) as smtp:
+        if config.get('MAIL_USE_TLS'):
+            smtp.starttls()
+        if config.get('MAIL_USERNAME'):
+            smtp.login(config['MAIL_USERNAME'], config.get('MAIL_PASSWORD'))
+        for message in messages:
+            try:
+                smtp.send_message(message)
+                errors.append(None)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                # Rejected by the server; retry just this one, keep the connection
+                errors.append(e)
+    return errors
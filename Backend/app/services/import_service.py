@@ -0,0 +1,201 @@
+import codecs
+import csv
+import io
+import json
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import insert
+from app.database import db
+from app.models import Parcel, PostponedOrder
+from app.models.parcel import PARCEL_STATUSES
+from app.services.analytics_service import apply_revenue_deltas
+from app.services.change_service import record_changes
+from app.services.status_service import apply_status_deltas, counters_enabled
+from app.services.version_service import bump_versions
+
+IMPORT_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 64 * 1024
+
+REQUIRED_FIELDS = ('customer_name', 'phone', 'product', 'destination')
+# Column name -> max length, from the Parcel model
+STRING_FIELDS = {
+    'customer_name': 100,
+    'phone': 20,
+    'alt_phone': 20,
+    'product': 200,
+    'destination': 100,
+    'courier': 100
+}
+
+
+def iter_csv_rows(stream):
+    """Yield dicts from a CSV byte stream with a header row, one line at a time."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    yield from csv.DictReader(text)
+
+
+def iter_ndjson_rows(stream):
+    for line in io.TextIOWrapper(stream, encoding='utf-8'):
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_array(stream):
+    """
+    Yield the elements of a top-level JSON array without reading it all.
+
+    Decodes one element at a time from a rolling buffer filled in
+    READ_CHUNK_SIZE chunks.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = stream.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + utf8.decode(chunk or b'', final=eof)
+        pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            fill()
+            continue
+
+        if not started:
+            if buffer[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Malformed JSON array")
+            fill()
+            continue
+        # A number cut off at the chunk boundary would still decode
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+        pos = end
+        yield item
+
+
+def validate_parcel_row(row):
+    """Return (values, errors) for one imported row."""
+    if not isinstance(row, dict):
+        return None, ["Row must be an object"]
+
+    errors = []
+    values = {}
+    for field, max_length in STRING_FIELDS.items():
+        value = row.get(field)
+        value = str(value).strip() if value not in (None, '') else None
+        if value is None and field in REQUIRED_FIELDS:
+            errors.append(f"{field} is required")
+        elif value is not None and len(value) > max_length:
+            errors.append(f"{field} must be at most {max_length} characters")
+        values[field] = value
+
+    amount = row.get('expected_amount')
+    try:
+        values['expected_amount'] = float(amount) if amount not in (None, '') else 0.0
+    except (TypeError, ValueError):
+        errors.append("expected_amount must be a number")
+
+    status = (row.get('status') or 'pending').strip().lower()
+    if status not in PARCEL_STATUSES:
+        errors.append(f"status must be one of: {', '.join(PARCEL_STATUSES)}")
+    values['status'] = status
+
+    return values, errors
+
+
+def _insert_batch(batch, notes):
+    """Insert a batch of parcels plus their postponed orders with two statements."""
+    inserted = db.session.execute(
+        insert(Parcel).returning(Parcel.id, Parcel.status, sort_by_parameter_order=True),
+        batch
+    ).all()
+
+    postponed = [
+        {'parcel_id': parcel_id, 'notes': notes, 'is_resolved': False, 'created_at': batch[0]['created_at']}
+        for parcel_id, status in inserted if status == 'postponed'
+    ]
+    record_changes(db.session, 'parcels', [parcel_id for parcel_id, _ in inserted], 'insert')
+    if postponed:
+        order_ids = db.session.execute(
+            insert(PostponedOrder).returning(PostponedOrder.id, sort_by_parameter_order=True), postponed
+        ).scalars().all()
+        record_changes(db.session, 'postponed_orders', order_ids, 'insert')
+
+    # Core inserts skip the ORM flush hooks, so keep the counters and the
+    # revenue rollup in step here, in the same transaction
+    connection = db.session.connection()
+    if counters_enabled():
+        apply_status_deltas(connection, Counter(row['status'] for row in batch))
+
+    revenue = defaultdict(lambda: [0.0, 0])
+    for row in batch:
+        if row['status'] == 'paid':
+            month = row['updated_at'].strftime('%Y-%m')
+            revenue[month][0] += row['expected_amount']
+            revenue[month][1] += 1
+    if revenue:
+        apply_revenue_deltas(connection, {m: tuple(d) for m, d in revenue.items()})
+    bump_versions(connection, ('parcels', 'postponed_orders') if postponed else ('parcels',))
+
+    db.session.info['analytics_dirty'] = True
+    return len(inserted), len(postponed)
+
+
+def import_parcels(rows, user_id, batch_size=IMPORT_BATCH_SIZE, dry_run=False, max_errors=100):
+    """
+    Validate and insert parcels from an iterable of row dicts.
+
+    Valid rows are inserted in batches; invalid rows are skipped and
+    reported with their 1-based row number. Nothing is committed here.
+    """
+    summary = {"received": 0, "imported": 0, "postponed_orders": 0, "failed": 0, "errors": []}
+    batch = []
+    now = datetime.utcnow()
+
+    for number, row in enumerate(rows, start=1):
+        summary["received"] += 1
+        values, errors = validate_parcel_row(row)
+        if errors:
+            summary["failed"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append({"row": number, "errors": errors})
+            continue
+
+        values.update(user_id=user_id, created_at=now, updated_at=now)
+        batch.append(values)
+        if len(batch) >= batch_size:
+            if not dry_run:
+                imported, postponed = _insert_batch(batch, "Auto-created from import")
+                summary["imported"] += imported
+                summary["postponed_orders"] += postponed
+            batch = []
+
+    if batch and not dry_run:
+        imported, postponed = _insert_batch(batch, "Auto-created from import")
+        summary["imported"] += imported
+        summary["postponed_orders"] += postponed
+
+    return summary
@@ -0,0 +1,244 @@
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case, delete, func, select, update
+from app.database import db
+from app.models import Job
+from app.services.watermark_service import claim_interval
+
+# kind -> (handler, batch)
+_handlers = {}
+# kind -> config setting with its interval in seconds
+_schedules = {}
+
+
+def job_handler(kind, batch=False):
+    """
+    Register the function that runs jobs of `kind`.
+
+    A plain handler is called with one payload per job. A `batch` handler
+    gets every claimed payload of its kind at once (e.g. to send a batch
+    of emails over one SMTP connection) and returns one exception or None
+    per payload, in order. Raising fails the whole batch.
+    """
+    def decorator(fn):
+        _handlers[kind] = (fn, batch)
+        return fn
+    return decorator
+
+
+def periodic(kind, interval_setting):
+    """
+    Have running workers queue a `kind` job every app.config[interval_setting] seconds.
+
+    However many workers run, each interval queues one job. 0 turns the
+    schedule off.
+    """
+    def decorator(fn):
+        _schedules[kind] = interval_setting
+        return fn
+    return decorator
+
+
+def enqueue(kind, payload, delay=None, max_attempts=None):
+    """
+    Add a job to the caller's session; it becomes visible when they commit.
+
+    Queuing in the same transaction as the write that caused it means a
+    rolled-back request sends nothing, and a committed one can't lose its
+    job.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status='queued',
+        attempts=0,
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 5),
+        run_at=datetime.utcnow() + (delay or timedelta()),
+    )
+    db.session.add(job)
+    return job
+
+
+def retry_delay(attempts, base, cap):
+    """Exponential backoff with +/-20% jitter so failed batches don't retry in lockstep."""
+    delay = min(base * 2 ** (attempts - 1), cap)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def job_counts():
+    counts = dict.fromkeys(('queued', 'running', 'done', 'dead'), 0)
+    counts.update(dict(db.session.execute(select(Job.status, func.count(Job.id)).group_by(Job.status)).all()))
+    return counts
+
+
+def requeue_dead(kind=None):
+    """Give dead-lettered jobs a fresh set of attempts; returns how many."""
+    statement = update(Job).where(Job.status == 'dead')
+    if kind:
+        statement = statement.where(Job.kind == kind)
+    count = db.session.execute(statement.values(
+        status='queued', attempts=0, run_at=datetime.utcnow(), locked_by=None, locked_at=None
+    )).rowcount
+    db.session.commit()
+    return count
+
+
+class JobWorker:
+    """
+    Claims due jobs in batches and runs them on a thread pool.
+
+    Any number of workers may share the jobs table. A claim marks rows
+    running under a token unique to that claim (with SKIP LOCKED on
+    Postgres), so each job goes to one worker. A job running longer than
+    JOB_LEASE_SECONDS is presumed lost with its worker and is queued
+    again. Failures retry with exponential backoff until max_attempts,
+    then stay in the table as `dead` until requeued.
+    """
+
+    def __init__(self, app, batch_size=None, concurrency=None):
+        config = app.config
+        self.app = app
+        self.batch_size = batch_size or config.get('JOB_BATCH_SIZE', 50)
+        self.concurrency = concurrency or config.get('JOB_CONCURRENCY', 4)
+        self.poll_interval = config.get('JOB_POLL_SECONDS', 1.0)
+        self.lease = timedelta(seconds=config.get('JOB_LEASE_SECONDS', 300))
+        self.retry_base = config.get('JOB_RETRY_BASE_SECONDS', 30)
+        self.retry_cap = config.get('JOB_RETRY_MAX_SECONDS', 3600)
+        self.retention = timedelta(hours=config.get('JOB_RETENTION_HOURS', 24))
+        self.name = f'{os.uname().nodename}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self._pruned_at = 0.0
+
+    def run(self, once=False):
+        """Process jobs until stop() is called; with `once`, until none are due."""
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='job') as pool:
+            while not self.stopping.is_set():
+                with self.app.app_context():
+                    self._maintain()
+                    jobs = self.claim()
+                if jobs:
+                    self._run_batch(pool, jobs)
+                elif once:
+                    break
+                else:
+                    self.stopping.wait(self.poll_interval)
+
+    def stop(self):
+        self.stopping.set()
+
+    def claim(self):
+        """Mark up to batch_size due jobs as running for this worker and return them."""
+        now = datetime.utcnow()
+        token = f'{self.name}:{uuid.uuid4().hex[:12]}'
+        due = (
+            select(Job.id)
+            .where(Job.status == 'queued', Job.run_at <= now)
+            .order_by(Job.run_at, Job.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ids = db.session.execute(due).scalars().all()
+        if not ids:
+            db.session.rollback()
+            return []
+        # The status check keeps a concurrent claim (SQLite has no SKIP LOCKED) from taking a row twice
+        db.session.execute(
+            update(Job)
+            .where(Job.id.in_(ids), Job.status == 'queued')
+            .values(status='running', locked_by=token, locked_at=now, attempts=Job.attempts + 1)
+        )
+        jobs = db.session.execute(
+            select(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .where(Job.locked_by == token, Job.status == 'running')
+        ).all()
+        db.session.commit()
+        return jobs
+
+    def _maintain(self):
+        # Requeue jobs whose worker died mid-run; their attempt already counts
+        cutoff = datetime.utcnow() - self.lease
+        db.session.execute(
+            update(Job)
+            .where(Job.status == 'running', Job.locked_at < cutoff)
+            .values(
+                status=case((Job.attempts >= Job.max_attempts, 'dead'), else_='queued'),
+                locked_by=None,
+                last_error='Lease expired'
+            )
+        )
+        for kind, setting in _schedules.items():
+            seconds = self.app.config.get(setting)
+            if seconds and claim_interval(f'schedule:{kind}', timedelta(seconds=seconds)):
+                enqueue(kind, {}, max_attempts=1)
+        if time.monotonic() - self._pruned_at >= 600:
+            db.session.execute(delete(Job).where(
+                Job.status == 'done', Job.finished_at < datetime.utcnow() - self.retention
+            ))
+            self._pruned_at = time.monotonic()
+        db.session.commit()
+
+    def _run_batch(self, pool, jobs):
+        by_kind = defaultdict(list)
+        for job in jobs:
+            by_kind[job.kind].append(job)
+
+        futures = []
+        for kind, group in by_kind.items():
+            handler, batch = _handlers.get(kind, (None, False))
+            if handler is None:
+                futures.append((group, None))
+            elif batch:
+                futures.append((group, pool.submit(self._call, handler, [j.payload for j in group], len(group))))
+            else:
+                futures.extend(([job], pool.submit(self._call, handler, job.payload)) for job in group)
+
+        outcomes = []
+        for group, future in futures:
+            if future is None:
+                errors = [LookupError(f"No handler for job kind '{group[0].kind}'")] * len(group)
+            else:
+                errors = future.result()
+            outcomes.extend(zip(group, errors))
+
+        with self.app.app_context():
+            self._record(outcomes)
+
+    def _call(self, handler, payload, batch_size=None):
+        """One exception or None per job."""
+        with self.app.app_context():
+            try:
+                result = handler(payload)
+            except Exception as e:
+                self.app.logger.exception("Job handler %s failed", handler.__name__)
+                return [e] * (batch_size or 1)
+        return list(result) if batch_size else [None]
+
+    def _record(self, outcomes):
+        now = datetime.utcnow()
+        done = [job.id for job, error in outcomes if error is None]
+        if done:
+            db.session.execute(
+                update(Job).where(Job.id.in_(done))
+                .values(status='done', finished_at=now, locked_by=None, last_error=None)
+            )
+        for job, error in outcomes:
+            if error is None:
+                continue
+            if job.attempts >= job.max_attempts:
+                values = {'status': 'dead', 'finished_at': now}
+                self.app.logger.error("Job %s (%s) dead after %d attempts: %s", job.id, job.kind, job.attempts, error)
+            else:
+                values = {'status': 'queued', 'run_at': now + retry_delay(job.attempts, self.retry_base, self.retry_cap)}
+            db.session.execute(
+                update(Job).where(Job.id == job.id)
+                .values(locked_by=None, last_error=f'{type(error).__name__}: {error}'[:2000], **values)
+            )
+        db.session.commit()
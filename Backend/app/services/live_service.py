@@ -0,0 +1,193 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from app.database import db
+from app.services.analytics_service import compute_dashboard_overview, compute_dashboard_stats
+from app.services.change_service import CursorExpired, get_changes
+from app.services.version_service import get_versions
+from app.utils.sse import Broadcaster, format_event
+
+TOPICS = ('dashboard', 'parcels')
+# Writes to these tables can change the dashboard numbers
+DASHBOARD_TABLES = ('parcels', 'expenses')
+
+
+class LiveFeed:
+    """
+    Pushes dashboard and parcel updates to the open event streams.
+
+    One producer thread per worker does the polling for every stream in
+    it, so N open dashboards cost one computation instead of N polls:
+    each tick reads the table versions (one primary-key query) and the
+    parcel changes since its cursor, and publishes a `parcel` event per
+    status change. Dashboard numbers are recomputed when a version moved,
+    at most once per SSE_DEBOUNCE_SECONDS, and only the keys that changed
+    are sent. Each event is encoded once and shared by every stream.
+
+    The thread starts with the first stream in a worker and stops with the
+    last one, so workers nobody is watching don't poll.
+    """
+
+    def __init__(self):
+        self.broadcaster = Broadcaster()
+        self.app = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._reset()
+
+    def init_app(self, app):
+        self.app = app
+
+    def _reset(self):
+        self._versions = None
+        self._cursor = None
+        self._dashboard = None
+        self._dirty = True
+        self._computed_at = 0.0
+        self._statuses = OrderedDict()
+
+    # -- streams -------------------------------------------------------------
+
+    def subscribe(self, topics):
+        """A new subscription, or None when the worker already has SSE_MAX_STREAMS open."""
+        config = self.app.config
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: nothing from the parent's producer carries over
+                self.broadcaster = Broadcaster()
+                self._thread = None
+                self._pid = os.getpid()
+                self._reset()
+            if len(self.broadcaster) >= config.get('SSE_MAX_STREAMS', 50):
+                return None
+            subscription = self.broadcaster.subscribe(topics, config.get('SSE_QUEUE_SIZE', 100))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.broadcaster.unsubscribe(subscription)
+
+    def stream(self, subscription):
+        """
+        The event stream for one subscription.
+
+        Opens with the current dashboard (when subscribed and already
+        computed; otherwise it follows with the producer's first one) and
+        a comment every SSE_HEARTBEAT_SECONDS keeps proxies from closing
+        an idle connection and lets a dead client be noticed on write.
+        """
+        config = self.app.config
+        heartbeat = config.get('SSE_HEARTBEAT_SECONDS', 15)
+        retry_ms = int(config.get('SSE_RETRY_SECONDS', 5) * 1000)
+        snapshot = self._dashboard
+        try:
+            yield f'retry: {retry_ms}\n\n'
+            if 'dashboard' in subscription.topics and snapshot is not None:
+                yield self._encode('dashboard', snapshot)
+            while True:
+                try:
+                    message = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if message is None:
+                    # Dropped for falling behind; the client reconnects
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    # -- producer ------------------------------------------------------------
+
+    def _encode(self, event, data):
+        return format_event(event, self.app.json.dumps(data))
+
+    def _run(self):
+        poll = self.app.config.get('SSE_POLL_SECONDS', 1)
+        while True:
+            with self._lock:
+                if not len(self.broadcaster):
+                    # Last stream closed; the next subscribe starts a new thread
+                    self._thread = None
+                    self._reset()
+                    return
+            with self.app.app_context():
+                try:
+                    self._tick()
+                except Exception:
+                    self.app.logger.exception("Live feed update failed")
+                finally:
+                    db.session.remove()
+            time.sleep(poll)
+
+    def _tick(self):
+        versions, _ = get_versions(('parcels', 'postponed_orders', 'expenses'))
+        if self._versions is None:
+            # Start from now: streams only carry what happens while they are open
+            _, self._cursor, _ = get_changes()
+        elif versions != self._versions:
+            if any(versions[table] != self._versions[table] for table in DASHBOARD_TABLES):
+                self._dirty = True
+        self._versions = versions
+
+        # Polled every tick: a change is readable only once every change id
+        # before it has committed, which may be a tick after the version moved
+        self._publish_parcels()
+
+        debounce = self.app.config.get('SSE_DEBOUNCE_SECONDS', 2)
+        if self._dirty and time.monotonic() - self._computed_at >= debounce:
+            self._publish_dashboard()
+
+    def _publish_parcels(self):
+        has_more = True
+        while has_more:
+            try:
+                changes, self._cursor, has_more = get_changes(self._cursor, 500, ['parcels'])
+            except CursorExpired:
+                _, self._cursor, _ = get_changes()
+                return
+            for change in changes:
+                event = self._parcel_event(change)
+                if event:
+                    self.broadcaster.publish('parcels', self._encode('parcel', event))
+
+    def _parcel_event(self, change):
+        """{"id", "op", "status", "previous_status", "parcel"} when the status changed; None otherwise."""
+        previous = self._statuses.pop(change['id'], None)
+        if change['op'] == 'delete':
+            return {"id": change['id'], "op": "delete", "status": None, "previous_status": previous, "parcel": None}
+
+        status = change['data']['status']
+        self._statuses[change['id']] = status
+        if len(self._statuses) > self.app.config.get('SSE_STATUS_CACHE_SIZE', 10000):
+            self._statuses.popitem(last=False)
+        # Updates to parcels not seen before are sent too: their old status is unknown
+        if change['op'] == 'update' and previous == status:
+            return None
+        return {"id": change['id'], "op": change['op'], "status": status, "previous_status": previous, "parcel": change['data']}
+
+    def _publish_dashboard(self):
+        # Not through the analytics cache: with the memory backend a write made
+        # in another worker leaves this one's copy stale until it expires
+        dashboard = {"overview": compute_dashboard_overview(), "stats": compute_dashboard_stats()}
+        self._dirty = False
+        self._computed_at = time.monotonic()
+
+        previous = self._dashboard or {}
+        delta = {}
+        for section, values in dashboard.items():
+            changed = {k: v for k, v in values.items() if previous.get(section, {}).get(k) != v}
+            if changed:
+                delta[section] = changed
+        self._dashboard = dashboard
+        if delta:
+            self.broadcaster.publish('dashboard', self._encode('dashboard', delta))
+
+
+live_feed = LiveFeed()
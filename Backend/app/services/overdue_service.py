@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+from app.database import db
+from app.models import Parcel, PostponedOrder
+from app.services.bulk_service import bulk_update_status
+from app.services.job_service import job_handler, periodic
+from app.services.watermark_service import get_watermark, set_watermark
+
+PENDING_WATERMARK = 'overdue:pending_created_at'
+POSTPONED_WATERMARK = 'overdue:postponed_delivery_date'
+
+
+def stale_pending(since, cutoff):
+    """Pending parcels created in [since, cutoff); a range scan on ix_parcels_status_created_at."""
+    query = select(Parcel.id, Parcel.created_at).where(Parcel.status == 'pending', Parcel.created_at < cutoff)
+    if since is not None:
+        query = query.where(Parcel.created_at >= since)
+    return query.order_by(Parcel.created_at, Parcel.id)
+
+
+def past_due_postponed(since, cutoff):
+    """Postponed parcels whose open order fell due in [since, cutoff); a range scan on ix_postponed_orders_queue."""
+    query = (
+        select(PostponedOrder.parcel_id, PostponedOrder.new_delivery_date)
+        .join(Parcel, Parcel.id == PostponedOrder.parcel_id)
+        .where(
+            PostponedOrder.is_resolved.is_(False),
+            PostponedOrder.new_delivery_date < cutoff,
+            Parcel.status == 'postponed'
+        )
+    )
+    if since is not None:
+        query = query.where(PostponedOrder.new_delivery_date >= since)
+    return query.order_by(PostponedOrder.new_delivery_date, PostponedOrder.parcel_id)
+
+
+def _mark_in_chunks(select_rows, status, watermark, cutoff, chunk_size, full):
+    """
+    Move the selected parcels to overdue chunk_size at a time.
+
+    Each chunk is its own short transaction that also advances the
+    watermark, so an interrupted run resumes where it stopped. Rows at
+    the watermark itself are looked at again, which is harmless since
+    the ones already moved no longer match.
+    """
+    since = None if full else get_watermark(watermark)
+    total = 0
+    while True:
+        rows = db.session.execute(select_rows(since, cutoff).limit(chunk_size)).all()
+        if not rows:
+            break
+        # Re-check the status: a parcel paid since the SELECT must stay paid
+        result = bulk_update_status([Parcel.id.in_([row[0] for row in rows]), Parcel.status == status], 'overdue')
+        total += result['updated']
+        since = rows[-1][1]
+        set_watermark(watermark, since)
+        db.session.commit()
+        if len(rows) < chunk_size:
+            break
+
+    # Nothing before the cutoff is left; start there next time
+    set_watermark(watermark, cutoff)
+    db.session.commit()
+    return total
+
+
+def mark_overdue(now=None, full=False, chunk_size=None):
+    """
+    Move parcels that are past due to `overdue`.
+
+    Two rules: parcels still pending OVERDUE_PENDING_DAYS after they were
+    created, and postponed parcels whose open order's delivery date is
+    before today. Each rule keeps a watermark, so a run only looks at rows
+    that became eligible since the last one. `full` ignores the
+    watermarks, which also catches rows moved back into an eligible state
+    by hand (e.g. set to pending again, or rescheduled into the past).
+    """
+    config = current_app.config
+    now = now or datetime.utcnow()
+    chunk_size = chunk_size or config.get('OVERDUE_CHUNK_SIZE', 1000)
+    today = datetime.combine(now.date(), datetime.min.time())
+
+    return {
+        "pending": _mark_in_chunks(
+            stale_pending, 'pending', PENDING_WATERMARK,
+            now - timedelta(days=config.get('OVERDUE_PENDING_DAYS', 7)), chunk_size, full
+        ),
+        "postponed": _mark_in_chunks(
+            past_due_postponed, 'postponed', POSTPONED_WATERMARK, today, chunk_size, full
+        )
+    }
+
+
+@periodic('mark_overdue', 'OVERDUE_INTERVAL_SECONDS')
+@job_handler('mark_overdue')
+def _mark_overdue_job(payload):
+    moved = mark_overdue(full=payload.get('full', False))
+    current_app.logger.info("Marked overdue: %s", moved)
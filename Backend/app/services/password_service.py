@@ -0,0 +1,80 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+
+def _setting(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+class PasswordHasherBusy(Exception):
+    """Every hashing slot is taken; the caller should answer 503 and let the client retry."""
+
+
+class BoundedHasher:
+    """
+    Runs password hashing on a small thread pool with a capped backlog.
+
+    hashlib's scrypt and pbkdf2 release the GIL, so other request threads
+    keep running while a hash is computed, and a login burst queues here
+    instead of occupying every worker thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+
+    def _pool(self, workers, backlog):
+        with self._lock:
+            # Executor threads don't survive a fork; start fresh in each worker
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+                self._slots = threading.BoundedSemaphore(workers + backlog)
+                self._pid = os.getpid()
+            return self._executor, self._slots
+
+    def run(self, fn, *args):
+        workers = _setting('PASSWORD_HASH_WORKERS', 2)
+        if workers <= 0:
+            return fn(*args)
+
+        executor, slots = self._pool(workers, _setting('PASSWORD_HASH_BACKLOG', 32))
+        if not slots.acquire(timeout=_setting('PASSWORD_HASH_WAIT', 5)):
+            raise PasswordHasherBusy()
+        try:
+            return executor.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+
+hasher = BoundedHasher()
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    # werkzeug fills in default cost parameters; hash once to see the full prefix
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def hash_password(password):
+    return hasher.run(generate_password_hash, password, _setting('PASSWORD_HASH_METHOD', DEFAULT_METHOD))
+
+
+def verify_password(password_hash, password):
+    return hasher.run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """True when the stored hash uses a different algorithm or cost than configured."""
+    method = _setting('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return password_hash.split('$', 1)[0] != _method_prefix(method)
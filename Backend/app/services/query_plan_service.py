@@ -0,0 +1,122 @@
+import json
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+from app.database import db
+from app.models import Change, Expense, Parcel, PostponedOrder
+from app.services.overdue_service import past_due_postponed, stale_pending
+from app.utils.filters import filter_expenses, filter_parcels, filter_postponed, sort_expenses
+from app.utils.pagination import encode_cursor, keyset_query
+
+# SQLite: "SCAN parcels" is a full table scan; "SCAN parcels USING INDEX ..." is not
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def hot_queries():
+    """
+    The list, stats and analytics queries that must stay on an index.
+
+    Built with the same filter and pagination helpers the routes use, so
+    a change to either shows up here.
+    """
+    now = datetime.utcnow()
+    month_start = datetime(now.year, now.month, 1)
+    week_ago = (now - timedelta(days=7)).isoformat()
+    cursor = encode_cursor(now, 1000)
+
+    return {
+        'parcels: newest page': filter_parcels(Parcel.query, {})
+            .order_by(Parcel.created_at.desc()).limit(20),
+        'parcels: by status': filter_parcels(Parcel.query, {'status': 'pending'})
+            .order_by(Parcel.created_at.desc()).limit(20),
+        'parcels: keyset page': keyset_query(Parcel.query, Parcel, cursor).limit(21),
+        'parcels: keyset page by status': keyset_query(
+            filter_parcels(Parcel.query, {'status': 'pending'}), Parcel, cursor
+        ).limit(21),
+        'parcels: by creator': filter_parcels(Parcel.query, {'user_id': '1'})
+            .order_by(Parcel.created_at.desc()).limit(20),
+        'parcels: created range': filter_parcels(Parcel.query, {'created_from': week_ago})
+            .order_by(Parcel.created_at.desc()).limit(20),
+        'parcels: overdue list': Parcel.query.filter_by(status='overdue'),
+        'overdue: stale pending scan': stale_pending(now - timedelta(days=8), now - timedelta(days=7)).limit(1000),
+        'overdue: past-due postponed scan': past_due_postponed(now - timedelta(days=1), now).limit(1000),
+        'changes: feed window': db.session.query(Change.id, Change.changed_at).filter(Change.id > 1000)
+            .order_by(Change.id).limit(501),
+        'changes: feed page': Change.query.filter(Change.id > 1000, Change.id <= 1500, Change.entity == 'parcels')
+            .order_by(Change.id),
+        'stats: status counts': db.session.query(Parcel.status, func.count(Parcel.id))
+            .group_by(Parcel.status),
+        'analytics: paid revenue': db.session.query(func.sum(Parcel.expected_amount))
+            .filter(Parcel.status == 'paid', Parcel.updated_at >= month_start),
+        'expenses: newest page': sort_expenses(filter_expenses(Expense.query, {}), {}).limit(20),
+        'expenses: by category': sort_expenses(
+            filter_expenses(Expense.query, {'category_id': '1'}), {}
+        ).limit(20),
+        'expenses: date range': sort_expenses(
+            filter_expenses(Expense.query, {'date_from': week_ago}), {}
+        ).limit(20),
+        'postponed: due queue': filter_postponed(
+            PostponedOrder.query.filter(PostponedOrder.is_resolved.is_(False)), {'due': 'overdue'}
+        ).order_by(PostponedOrder.new_delivery_date.asc().nulls_last(), PostponedOrder.id.asc()).limit(20),
+    }
+
+
+def _compile(query, dialect):
+    statement = getattr(query, 'statement', query)
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _sqlite_plan(sql):
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    lines = [row[-1] for row in rows]
+    scans = [m.group(1) for m in (_SQLITE_FULL_SCAN.match(line) for line in lines) if m]
+    return lines, scans
+
+
+def _postgres_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _postgres_nodes(child)
+
+
+def _postgres_plan(sql):
+    plan = db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = list(_postgres_nodes(plan[0]['Plan']))
+    lines = [
+        f"{node['Node Type']}" + (f" on {node['Relation Name']}" if 'Relation Name' in node else '')
+        + (f" using {node['Index Name']}" if 'Index Name' in node else '')
+        for node in nodes
+    ]
+    scans = [node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan']
+    return lines, scans
+
+
+def check_query_plans():
+    """
+    EXPLAIN every hot query and report the ones that scan a whole table.
+
+    Returns a list of (name, plan lines, scanned tables). On Postgres
+    sequential scans are disabled for the check so an empty or tiny
+    table still shows whether a usable index exists. Nothing is written.
+    """
+    bind = db.session.get_bind()
+    dialect = bind.dialect
+    if dialect.name == 'postgresql':
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        explain = _postgres_plan
+    elif dialect.name == 'sqlite':
+        explain = _sqlite_plan
+    else:
+        raise RuntimeError(f"Query plan check is not supported on {dialect.name}")
+
+    try:
+        results = []
+        for name, query in hot_queries().items():
+            lines, scans = explain(_compile(query, dialect))
+            results.append((name, lines, scans))
+        return results
+    finally:
+        db.session.rollback()
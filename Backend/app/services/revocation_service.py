@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import db
+from app.models import RevokedToken
+
+# Ids are assigned before commit, so a revocation can become visible after
+# a higher id was already synced; re-read anything revoked this recently
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationStore:
+    """
+    Revoked token ids, checked in memory on every authenticated request.
+
+    The revoked_tokens table is the shared store. Each worker keeps
+    {jti: expiry} in memory and pulls rows newer than the last id it saw
+    at most every TOKEN_REVOCATION_SYNC_SECONDS, so the per-request check
+    is a dict lookup and only one query per interval hits the database.
+    Entries are dropped once the token would have expired anyway.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self._last_id = 0
+        self._synced_at = None
+        self._pruned_at = time.monotonic()
+        self.sync_interval = 1.0
+        self.prune_interval = 300.0
+
+    def init_app(self, app, jwt):
+        self.sync_interval = app.config.get('TOKEN_REVOCATION_SYNC_SECONDS', 1.0)
+        self.prune_interval = app.config.get('TOKEN_REVOCATION_PRUNE_SECONDS', 300.0)
+
+        @jwt.token_in_blocklist_loader
+        def _token_is_revoked(jwt_header, jwt_payload):
+            return self.is_revoked(jwt_payload)
+
+    def is_revoked(self, payload):
+        now = time.monotonic()
+        if self._synced_at is None or now - self._synced_at >= self.sync_interval:
+            # One thread syncs; the others answer from the current set
+            if self._lock.acquire(blocking=self._synced_at is None):
+                try:
+                    self._sync(now)
+                finally:
+                    self._lock.release()
+        return payload['jti'] in self._revoked
+
+    def _sync(self, now):
+        try:
+            with db.engine.connect() as connection:
+                rows = connection.execute(
+                    select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+                    .where(or_(
+                        RevokedToken.id > self._last_id,
+                        RevokedToken.revoked_at >= datetime.utcnow() - SYNC_OVERLAP
+                    ))
+                    .order_by(RevokedToken.id)
+                ).all()
+                for row_id, jti, expires_at in rows:
+                    self._revoked[jti] = expires_at
+                    self._last_id = max(self._last_id, row_id)
+
+                if now - self._pruned_at >= self.prune_interval:
+                    self._prune(connection)
+                    self._pruned_at = now
+        except SQLAlchemyError as e:
+            # Keep serving the last known set; retry on the next interval
+            current_app.logger.warning("Token revocation sync failed: %s", e)
+        self._synced_at = now
+
+    def _prune(self, connection):
+        cutoff = datetime.utcnow()
+        connection.execute(delete(RevokedToken).where(RevokedToken.expires_at < cutoff))
+        connection.commit()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp >= cutoff}
+
+    def revoke(self, *payloads):
+        """Revoke decoded tokens and commit. Already revoked ones are skipped."""
+        fallback = datetime.utcnow() + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        added = {}
+        for payload in payloads:
+            jti = payload['jti']
+            if jti in self._revoked or jti in added:
+                continue
+            exp = payload.get('exp')
+            # Keep the row exactly as long as the token could still be presented
+            expires_at = datetime.utcfromtimestamp(exp) if exp else fallback
+            db.session.add(RevokedToken(
+                jti=jti,
+                token_type=payload.get('type', 'access'),
+                user_id=int(payload['sub']) if payload.get('sub') else None,
+                expires_at=expires_at
+            ))
+            added[jti] = expires_at
+        db.session.commit()
+        # Visible in this worker at once; the others pick it up on their next sync
+        self._revoked.update(added)
+        return len(added)
+
+    def stats(self):
+        return {"revoked": len(self._revoked), "last_id": self._last_id, "sync_interval": self.sync_interval}
+
+
+revocation_store = RevocationStore()
@@ -0,0 +1,28 @@
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import current_app
+from flask_migrate import upgrade
+from app.database import db
+
+
+def schema_revisions():
+    """(revisions the database is at, head revisions in migrations/), read without reflecting the schema."""
+    config = current_app.extensions['migrate'].migrate.get_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current, heads
+
+
+def upgrade_if_needed():
+    """
+    Apply pending migrations; a no-op costing one query when already at head.
+
+    Returns (revisions before, heads). Databases created by the old
+    create_all() boot have no alembic_version yet; the early revisions
+    use IF NOT EXISTS so upgrading them adopts the existing tables.
+    """
+    current, heads = schema_revisions()
+    if current != heads:
+        upgrade()
+    return current, heads
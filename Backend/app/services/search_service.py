@@ -0,0 +1,123 @@
+from sqlalchemy import DDL, Float, Integer, event, func, literal_column, or_, text
+from app.database import db
+from app.models import Parcel
+
+# Columns the parcel search box looks at
+SEARCH_COLUMNS = ('customer_name', 'phone', 'product', 'destination', 'courier')
+
+# Trigram indexes can't serve terms shorter than one trigram
+MIN_INDEXED_TERM = 3
+
+_cols = ', '.join(SEARCH_COLUMNS)
+_new_cols = ', '.join(f'new.{c}' for c in SEARCH_COLUMNS)
+_old_cols = ', '.join(f'old.{c}' for c in SEARCH_COLUMNS)
+
+# SQLite (dev/tests): external-content FTS5 table kept in sync by triggers
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS parcels_fts USING fts5("
+    f"{_cols}, content='parcels', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS parcels_fts_ai AFTER INSERT ON parcels BEGIN "
+    f"INSERT INTO parcels_fts(rowid, {_cols}) VALUES (new.id, {_new_cols}); END",
+    f"CREATE TRIGGER IF NOT EXISTS parcels_fts_ad AFTER DELETE ON parcels BEGIN "
+    f"INSERT INTO parcels_fts(parcels_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old_cols}); END",
+    f"CREATE TRIGGER IF NOT EXISTS parcels_fts_au AFTER UPDATE OF {_cols} ON parcels BEGIN "
+    f"INSERT INTO parcels_fts(parcels_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old_cols}); "
+    f"INSERT INTO parcels_fts(rowid, {_cols}) VALUES (new.id, {_new_cols}); END",
+]
+
+_document_sql = " || ' ' || ".join(f"coalesce({c}, '')" for c in SEARCH_COLUMNS)
+
+# Postgres: one GIN trigram index over the concatenated search document
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_parcels_search_trgm ON parcels "
+    f"USING gin (({_document_sql}) gin_trgm_ops)",
+]
+
+for _statement in SQLITE_DDL:
+    event.listen(Parcel.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in POSTGRES_DDL:
+    event.listen(Parcel.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+
+# Detected search backend per database URL
+_backends = {}
+
+
+def _document():
+    # Same expression as the index definition so Postgres can use it
+    return literal_column(
+        "(" + " || ' ' || ".join(f"coalesce(parcels.{c}, '')" for c in SEARCH_COLUMNS) + ")"
+    )
+
+
+def _detect_backend(bind):
+    if bind.dialect.name == 'sqlite':
+        found = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'parcels_fts'"
+        )).first()
+        return 'fts5' if found else 'like'
+    if bind.dialect.name == 'postgresql':
+        found = db.session.execute(text(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        )).first()
+        return 'trgm' if found else 'like'
+    return 'like'
+
+
+def search_backend():
+    bind = db.session.get_bind()
+    key = str(bind.url)
+    if key not in _backends:
+        _backends[key] = _detect_backend(bind)
+    return _backends[key]
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_parcels(query, term):
+    """
+    Narrow a Parcel query to rows matching `term`.
+
+    Returns the filtered query and an ORDER BY expression ranking the best
+    matches first (None when the backend can't rank).
+    """
+    term = term.strip()
+    backend = search_backend()
+
+    if backend == 'like' or len(term) < MIN_INDEXED_TERM:
+        pattern = f'%{_escape_like(term)}%'
+        return query.filter(or_(
+            *[getattr(Parcel, c).ilike(pattern, escape='\\') for c in SEARCH_COLUMNS]
+        )), None
+
+    if backend == 'fts5':
+        # Quote the term as one phrase so it behaves like a substring match
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = text(
+            "SELECT rowid AS id, bm25(parcels_fts) AS rank "
+            "FROM parcels_fts WHERE parcels_fts MATCH :phrase"
+        ).bindparams(phrase=phrase).columns(id=Integer, rank=Float).subquery('search_matches')
+        # bm25 scores are negative; lower is a better match
+        return query.join(matches, Parcel.id == matches.c.id), matches.c.rank.asc()
+
+    doc = _document()
+    pattern = f'%{_escape_like(term)}%'
+    return query.filter(doc.ilike(pattern, escape='\\')), func.word_similarity(term, doc).desc()
+
+
+def rebuild_search_index():
+    """Create the search index if missing and repopulate it from parcels."""
+    bind = db.session.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_DDL:
+            db.session.execute(text(statement))
+        db.session.execute(text("INSERT INTO parcels_fts(parcels_fts) VALUES ('rebuild')"))
+    elif bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_DDL:
+            db.session.execute(text(statement))
+        db.session.execute(text("REINDEX INDEX ix_parcels_search_trgm"))
+    db.session.commit()
+    _backends.pop(str(bind.url), None)
+    return search_backend()
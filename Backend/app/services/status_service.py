@@ -0,0 +1,100 @@
+from collections import Counter
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect, insert, update
+from app.database import db
+from app.models import Parcel, ParcelStatusCounter, PostponedOrder
+from app.models.parcel import PARCEL_STATUSES
+
+
+def counters_enabled():
+    return has_app_context() and current_app.config.get('PARCEL_STATUS_COUNTERS', False)
+
+
+def get_parcel_status_counts():
+    """
+    Parcel count per status, with every known status present.
+
+    Reads the maintained counters table when enabled, otherwise runs a
+    single GROUP BY over parcels.
+    """
+    if counters_enabled():
+        rows = db.session.query(ParcelStatusCounter.status, ParcelStatusCounter.count).all()
+    else:
+        rows = db.session.query(Parcel.status, func.count(Parcel.id)).group_by(Parcel.status).all()
+
+    counts = dict.fromkeys(PARCEL_STATUSES, 0)
+    counts.update({status: count for status, count in rows if status is not None})
+    return counts
+
+
+def get_postponed_counts():
+    rows = db.session.query(
+        PostponedOrder.is_resolved, func.count(PostponedOrder.id)
+    ).group_by(PostponedOrder.is_resolved).all()
+
+    counts = {bool(resolved): count for resolved, count in rows}
+    return {
+        "active_postponed": counts.get(False, 0),
+        "resolved_postponed": counts.get(True, 0)
+    }
+
+
+def apply_status_deltas(connection, deltas):
+    """Add per-status deltas to the counters inside the caller's transaction."""
+    for status, delta in deltas.items():
+        if status is None or not delta:
+            continue
+        result = connection.execute(
+            update(ParcelStatusCounter)
+            .where(ParcelStatusCounter.status == status)
+            .values(count=ParcelStatusCounter.count + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(ParcelStatusCounter).values(status=status, count=delta))
+
+
+def rebuild_status_counters():
+    """Recompute every counter from the parcels table."""
+    counts = dict.fromkeys(PARCEL_STATUSES, 0)
+    counts.update(dict(
+        db.session.query(Parcel.status, func.count(Parcel.id)).group_by(Parcel.status).all()
+    ))
+
+    db.session.query(ParcelStatusCounter).delete()
+    db.session.add_all([
+        ParcelStatusCounter(status=status, count=count)
+        for status, count in counts.items() if status is not None
+    ])
+    db.session.commit()
+    return counts
+
+
+def _previous_status(parcel):
+    history = inspect(parcel).attrs.status.history
+    if history.deleted:
+        return history.deleted[0]
+    return parcel.status
+
+
+@event.listens_for(db.session, 'after_flush')
+def _track_status_changes(session, flush_context):
+    if not counters_enabled():
+        return
+
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Parcel):
+            deltas[obj.status or 'pending'] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Parcel):
+            deltas[_previous_status(obj)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Parcel):
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                deltas[history.deleted[0]] -= 1
+                deltas[history.added[0]] += 1
+
+    if deltas:
+        apply_status_deltas(session.connection(), deltas)
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import event, insert, select, update
+from app.database import db
+from app.models import TableVersion
+
+# Tables whose writes change what the conditional GET endpoints return
+VERSIONED_TABLES = ('parcels', 'postponed_orders', 'expenses', 'expense_categories', 'users')
+
+
+def bump_versions(connection, names):
+    """Advance the version of each table in `names` inside the caller's transaction."""
+    names = sorted(set(names))
+    if not names:
+        return
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(names))
+        .values(version=TableVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount < len(names):
+        # Databases built with create_all start without the rows the migration seeds
+        existing = set(connection.execute(
+            select(TableVersion.name).where(TableVersion.name.in_(names))
+        ).scalars())
+        connection.execute(insert(TableVersion), [
+            {'name': name, 'version': 1, 'updated_at': now} for name in names if name not in existing
+        ])
+
+
+def get_versions(names):
+    """({table: version}, latest updated_at) for `names`; missing tables count as version 0."""
+    rows = db.session.execute(
+        select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.name.in_(names))
+    ).all()
+    versions = dict.fromkeys(names, 0)
+    versions.update({name: version for name, version, _ in rows})
+    return versions, max((updated_at for _, _, updated_at in rows), default=None)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _bump_changed_tables(session, flush_context):
+    changed = set()
+    for obj in (*session.new, *session.deleted):
+        changed.add(getattr(obj, '__tablename__', None))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changed.add(getattr(obj, '__tablename__', None))
+    bump_versions(session.connection(), changed.intersection(VERSIONED_TABLES))
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+from app.models import Watermark
+
+
+def get_watermark(name):
+    row = db.session.get(Watermark, name)
+    return row.value if row else None
+
+
+def set_watermark(name, value):
+    """Record `value` for `name` in the caller's transaction."""
+    row = db.session.get(Watermark, name)
+    if row is None:
+        db.session.add(Watermark(name=name, value=value, updated_at=datetime.utcnow()))
+    else:
+        row.value = value
+        row.updated_at = datetime.utcnow()
+
+
+def claim_interval(name, interval, now=None):
+    """
+    True for exactly one caller once `interval` has passed since the last claim.
+
+    A conditional UPDATE, so any number of processes can ask and only one
+    wins; commits either way.
+    """
+    now = now or datetime.utcnow()
+    claimed = db.session.execute(
+        update(Watermark)
+        .where(Watermark.name == name, or_(Watermark.value.is_(None), Watermark.value <= now - interval))
+        .values(value=now, updated_at=now)
+    ).rowcount
+    if not claimed and db.session.get(Watermark, name) is None:
+        db.session.add(Watermark(name=name, value=now, updated_at=now))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another process created it first, and so won this round
+            db.session.rollback()
+            return False
+        return True
+    db.session.commit()
+    return bool(claimed)
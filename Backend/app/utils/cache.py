@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from app.utils.metrics import metrics
+
+
+class MemoryStore:
+    """Per-process store. Invalidation only reaches the current worker."""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generation = 0
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, generation = entry
+            if expires_at <= time.time() or generation != self._generation:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl, generation):
+        with self._lock:
+            # A write landed while this value was computed; don't cache it
+            if generation != self._generation:
+                return
+            self._entries[key] = (value, time.time() + ttl, generation)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+class SQLiteStore:
+    """
+    Store shared by every worker on the host through one SQLite file.
+
+    Entries are tagged with a generation number; invalidating bumps it,
+    which every worker sees on its next read.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, generation INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_generation ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO cache_generation (id, value) VALUES (1, 0)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # Forked gunicorn workers must not reuse the parent's connection
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def generation(self):
+        return self._connect().execute("SELECT value FROM cache_generation WHERE id = 1").fetchone()[0]
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT e.value FROM cache_entries e JOIN cache_generation g ON g.id = 1 "
+            "WHERE e.key = ? AND e.expires_at > ? AND e.generation = g.value",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl, generation):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, generation) "
+            "SELECT ?, ?, ?, value FROM cache_generation WHERE id = 1 AND value = ?",
+            (key, json.dumps(value), time.time() + ttl, generation)
+        )
+
+    def invalidate(self):
+        conn = self._connect()
+        conn.execute("UPDATE cache_generation SET value = value + 1 WHERE id = 1")
+        conn.execute(
+            "DELETE FROM cache_entries WHERE generation < (SELECT value FROM cache_generation WHERE id = 1)"
+        )
+
+
+class ResultCache:
+    """
+    TTL cache for computed results, invalidated explicitly on writes.
+
+    Configured from ANALYTICS_CACHE_BACKEND ('memory', 'sqlite' or 'none'),
+    ANALYTICS_CACHE_TTL (seconds) and ANALYTICS_CACHE_PATH.
+    """
+
+    def __init__(self):
+        self.store = None
+        self.ttl = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        backend = app.config.get('ANALYTICS_CACHE_BACKEND', 'memory')
+        self.ttl = app.config.get('ANALYTICS_CACHE_TTL', 60)
+        if backend == 'sqlite':
+            self.store = SQLiteStore(app.config['ANALYTICS_CACHE_PATH'])
+        elif backend == 'memory':
+            self.store = MemoryStore()
+        else:
+            self.store = None
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+        # The attributes are this worker's; /metrics adds up every worker's
+        metrics.inc('analytics_cache_events_total', (('event', attr),))
+
+    def cached(self, key):
+        def wrapper(fn):
+            @wraps(fn)
+            def decorator(*args, **kwargs):
+                if self.store is None or self.ttl <= 0:
+                    return fn(*args, **kwargs)
+
+                full_key = key
+                if args or kwargs:
+                    full_key = f"{key}:{args!r}:{sorted(kwargs.items())!r}"
+
+                value = self.store.get(full_key)
+                if value is not None:
+                    self._count('hits')
+                    return value
+
+                self._count('misses')
+                generation = self.store.generation()
+                value = fn(*args, **kwargs)
+                self.store.set(full_key, value, self.ttl, generation)
+                return value
+            return decorator
+        return wrapper
+
+    def invalidate(self):
+        if self.store is not None:
+            self.store.invalidate()
+            self._count('invalidations')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.store.name if self.store else "none",
+            "ttl": self.ttl,
+            "scope": "worker",
+            "worker_pid": os.getpid(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+class LRUCache:
+    """
+    Small per-process LRU with a TTL, for records read on every request.
+
+    Entries older than `ttl` seconds are reloaded, which bounds how long
+    another worker's change can go unseen here.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+analytics_cache = ResultCache()
@@ -0,0 +1,80 @@
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip still works
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'text/plain', 'text/html', 'text/csv', 'application/x-ndjson'
+})
+
+
+class Compressor:
+    """
+    Compresses response bodies the client accepts, brotli or gzip.
+
+    Only buffered responses of at least COMPRESS_MIN_SIZE bytes with a
+    text-like mimetype are compressed; streamed exports go out as they
+    are. COMPRESS_ALGORITHMS lists the encodings to offer in order of
+    preference (brotli is skipped if the package isn't installed); an
+    empty value turns compression off.
+    """
+
+    def __init__(self):
+        self.algorithms = ()
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app):
+        configured = app.config.get('COMPRESS_ALGORITHMS', 'br,gzip')
+        self.algorithms = tuple(
+            name for name in (a.strip() for a in configured.split(',')) if name == 'gzip' or (name == 'br' and brotli)
+        )
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        if self.algorithms:
+            app.after_request(self._compress)
+
+    def _choose(self):
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for name in self.algorithms:
+            quality = accepted[name]
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def _compress(self, response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        # Intermediaries must not hand a compressed body to a client that didn't ask for it
+        response.vary.add('Accept-Encoding')
+        if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or (response.content_length or 0) < self.min_size):
+            return response
+
+        encoding = self._choose()
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if encoding == 'br':
+            body = brotli.compress(data, quality=self.brotli_quality)
+        else:
+            body = gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # A strong validator names exact bytes, which just changed
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+
+compressor = Compressor()
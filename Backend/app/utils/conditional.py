@@ -0,0 +1,67 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from app.services.version_service import get_versions
+
+
+def conditional(*tables, daily=False):
+    """
+    ETag / Last-Modified validators for a GET view built from table versions.
+
+    The validators come from the table_versions rows of `tables` (every
+    table whose rows can appear in the response), the full request path
+    and the caller's identity. A matching If-None-Match, or failing that
+    If-Modified-Since, gets a 304 before the view runs, so no list query
+    and no serialization. `daily=True` is for views whose filters depend
+    on today's date.
+
+    Versions are read before the view queries, so a write landing in
+    between is served under the older tag and refetched next time, never
+    the other way round.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions, modified = get_versions(tables)
+            key = [request.full_path, str(get_jwt_identity()), *(f'{t}:{v}' for t, v in sorted(versions.items()))]
+            if daily:
+                today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                key.append(today.date().isoformat())
+                modified = max(modified, today) if modified else today
+            etag = hashlib.blake2b('|'.join(key).encode(), digest_size=12).hexdigest()
+            if modified:
+                # HTTP dates have whole-second precision: until that second is
+                # over another write could share it, so send no date yet
+                modified = modified.replace(microsecond=0)
+                if modified >= datetime.utcnow().replace(microsecond=0):
+                    modified = None
+                else:
+                    modified = modified.replace(tzinfo=timezone.utc)
+
+            if _not_modified(etag, modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if modified:
+                response.last_modified = modified
+            # Revalidate every time instead of heuristic caching off Last-Modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def _not_modified(etag, modified):
+    # If-None-Match wins when both are sent (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return bool(since and modified and modified <= since)
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+from app.models import Expense, Parcel, PostponedOrder
+
+POSTPONED_DUE_FILTERS = ('overdue', 'today', 'week', 'unscheduled')
+
+EXPENSE_SORTS = {
+    'date': Expense.date,
+    'amount': Expense.amount,
+    'id': Expense.id
+}
+
+
+def parse_datetime_arg(value, name):
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or datetime")
+    return parsed.replace(tzinfo=None)
+
+
+def parse_float_arg(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+
+
+def _filter_date_range(query, column, args, start_key, end_key):
+    if args.get(start_key):
+        query = query.filter(column >= parse_datetime_arg(args[start_key], start_key))
+    if args.get(end_key):
+        value = args[end_key]
+        end = parse_datetime_arg(value, end_key)
+        if len(value) == 10:
+            # A bare end date includes that whole day
+            query = query.filter(column < end + timedelta(days=1))
+        else:
+            query = query.filter(column <= end)
+    return query
+
+
+def parse_int_arg(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+def filter_parcels(query, args):
+    """Apply the parcel list filters in `args` (request.args or a dict) to `query`."""
+    if args.get('status'):
+        query = query.filter(Parcel.status == args['status'])
+    if args.get('user_id'):
+        query = query.filter(Parcel.user_id == parse_int_arg(args['user_id'], 'user_id'))
+    return _filter_date_range(query, Parcel.created_at, args, 'created_from', 'created_to')
+
+
+def filter_expenses(query, args):
+    """Apply the expense list filters in `args` (request.args) to `query`."""
+    query = _filter_date_range(query, Expense.date, args, 'date_from', 'date_to')
+    if args.get('category_id'):
+        query = query.filter(Expense.category_id == parse_int_arg(args['category_id'], 'category_id'))
+    if args.get('user_id'):
+        query = query.filter(Expense.user_id == parse_int_arg(args['user_id'], 'user_id'))
+    if args.get('min_amount'):
+        query = query.filter(Expense.amount >= parse_float_arg(args['min_amount'], 'min_amount'))
+    if args.get('max_amount'):
+        query = query.filter(Expense.amount <= parse_float_arg(args['max_amount'], 'max_amount'))
+    return query
+
+
+def sort_expenses(query, args):
+    sort = args.get('sort', 'date')
+    order = args.get('order', 'desc')
+    if sort not in EXPENSE_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(EXPENSE_SORTS)}")
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+
+    column = EXPENSE_SORTS[sort]
+    direction = column.asc() if order == 'asc' else column.desc()
+    # id breaks ties so pages are stable
+    tiebreak = Expense.id.asc() if order == 'asc' else Expense.id.desc()
+    return query.order_by(direction, tiebreak) if sort != 'id' else query.order_by(direction)
+
+
+def filter_postponed(query, args, now=None):
+    """Apply the postponed queue `due` filter to `query`."""
+    due = args.get('due')
+    if not due:
+        return query
+    if due not in POSTPONED_DUE_FILTERS:
+        raise ValueError(f"due must be one of: {', '.join(POSTPONED_DUE_FILTERS)}")
+
+    today = datetime.combine((now or datetime.utcnow()).date(), datetime.min.time())
+    if due == 'overdue':
+        return query.filter(PostponedOrder.new_delivery_date < today)
+    if due == 'today':
+        return query.filter(
+            PostponedOrder.new_delivery_date >= today,
+            PostponedOrder.new_delivery_date < today + timedelta(days=1)
+        )
+    if due == 'week':
+        return query.filter(
+            PostponedOrder.new_delivery_date >= today,
+            PostponedOrder.new_delivery_date < today + timedelta(days=7)
+        )
+    return query.filter(PostponedOrder.new_delivery_date.is_(None))
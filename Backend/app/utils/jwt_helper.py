@@ -1,6 +1,6 @@
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from app.models.user import User
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from app.services.auth_service import get_user_snapshot, token_is_current
 from app.utils import error_response
 
 def admin_required():
@@ -8,10 +8,16 @@ def admin_required():
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
-            if not user or user.role != 'admin':
+            claims = get_jwt()
+            # The role claim rejects non-admins without touching the database
+            if claims.get('role', 'admin') != 'admin':
+                return error_response("Admins only", "FORBIDDEN", 403)
+
+            # Still confirm against the (cached) user record so a demotion or
+            # deletion takes effect before the token expires
+            user = get_user_snapshot(get_jwt_identity())
+            if not user or user['role'] != 'admin' or not token_is_current(user, claims):
                 return error_response("Admins only", "FORBIDDEN", 403)
             return fn(*args, **kwargs)
         return decorator
-    return wrapper
\ No newline at end of file
+    return wrapper
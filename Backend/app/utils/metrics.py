@@ -0,0 +1,239 @@
+import glob
+import heapq
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# Statements quoted in a slow-request log line
+SLOW_LOG_QUERIES = 3
+
+HELP = {
+    'http_requests_total': ('counter', 'Requests by endpoint, method and status code.'),
+    'http_request_duration_seconds': ('histogram', 'Time to build the response, per endpoint.'),
+    'http_request_db_queries': ('histogram', 'SQL statements executed per request.'),
+    'db_queries_total': ('counter', 'SQL statements executed, per endpoint.'),
+    'db_query_duration_seconds_total': ('counter', 'Time spent in SQL statements, per endpoint.'),
+    'analytics_cache_events_total': ('counter', 'Analytics cache hits, misses and invalidations.'),
+}
+
+
+class Metrics:
+    """
+    Request and SQL metrics in Prometheus text format.
+
+    Each worker counts in memory and writes its totals to METRICS_DIR
+    (one JSON file per pid) at most every METRICS_FLUSH_SECONDS; /metrics
+    adds up every file so the numbers cover all gunicorn workers. Without
+    METRICS_DIR only the serving worker is reported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._flushed_at = 0.0
+        self._pid = os.getpid()
+        self.directory = None
+        self.flush_interval = 1.0
+        self.slow_request_ms = 0
+        self.logger = None
+
+    def init_app(self, app):
+        self.directory = app.config.get('METRICS_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_SECONDS', 1.0)
+        self.slow_request_ms = app.config.get('SLOW_REQUEST_MS', 1000)
+        self.logger = app.logger
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+    # -- recording ---------------------------------------------------------
+
+    def inc(self, name, labels, value=1.0):
+        with self._lock:
+            self._counters[(name, labels)] += value
+
+    def observe(self, name, labels, value, buckets):
+        with self._lock:
+            key = (name, labels)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def _start_request(self):
+        if self._pid != os.getpid():
+            # Forked worker: the parent's totals are reported from its own file
+            with self._lock:
+                self._counters.clear()
+                self._histograms.clear()
+                self._pid = os.getpid()
+        g.metrics_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+        g.sql_statements = []
+
+    def _finish_request(self, response):
+        self._record(response.status_code)
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request is skipped when an exception escapes the view
+        if 'metrics_started' in g and not g.get('metrics_recorded'):
+            self._record(500)
+
+    def _record(self, status):
+        if 'metrics_started' not in g:
+            return
+        g.metrics_recorded = True
+        elapsed = time.perf_counter() - g.metrics_started
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+
+        self.inc('http_requests_total', (('endpoint', endpoint), ('method', method), ('status', str(status))))
+        self.observe('http_request_duration_seconds', (('endpoint', endpoint), ('method', method)), elapsed, LATENCY_BUCKETS)
+        self.observe('http_request_db_queries', (('endpoint', endpoint),), g.sql_count, QUERY_COUNT_BUCKETS)
+        if g.sql_count:
+            self.inc('db_queries_total', (('endpoint', endpoint),), g.sql_count)
+            self.inc('db_query_duration_seconds_total', (('endpoint', endpoint),), g.sql_time)
+
+        if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms:
+            top = sorted(g.sql_statements, reverse=True)
+            self.logger.warning(
+                "Slow request: %s %s -> %s in %.0fms, %d queries (%.0fms SQL); top queries: %s",
+                method, request.full_path.rstrip('?'), status, elapsed * 1000, g.sql_count, g.sql_time * 1000,
+                ' | '.join(f"{duration * 1000:.0f}ms {statement}" for duration, statement in top) or 'none'
+            )
+
+        self._maybe_flush()
+
+    # -- aggregation ---------------------------------------------------------
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, labels, value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, labels, dict(h, counts=list(h['counts']))] for (name, labels), h in self._histograms.items()]
+            }
+
+    def _path(self):
+        return os.path.join(self.directory, f'worker-{os.getpid()}.json')
+
+    def _maybe_flush(self, force=False):
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_interval:
+            return
+        self._flushed_at = now
+        path = self._path()
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._snapshot(), f)
+        os.replace(tmp, path)
+
+    def _collect(self):
+        if not self.directory:
+            return [self._snapshot()]
+        self._maybe_flush(force=True)
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, 'worker-*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """All workers' metrics in Prometheus text exposition format."""
+        counters = defaultdict(float)
+        histograms = {}
+        for snapshot in self._collect():
+            for name, labels, value in snapshot['counters']:
+                counters[(name, tuple(map(tuple, labels)))] += value
+            for name, labels, h in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, {'buckets': h['buckets'], 'counts': [0] * len(h['buckets']), 'sum': 0.0, 'count': 0})
+                total['counts'] = [a + b for a, b in zip(total['counts'], h['counts'])]
+                total['sum'] += h['sum']
+                total['count'] += h['count']
+
+        lines = []
+        for name, (kind, description) in HELP.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_labels(labels)} {_number(value)}')
+            else:
+                for (metric, labels), h in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(h['buckets'], h['counts']):
+                        lines.append(f'{name}_bucket{_labels(labels + (("le", _number(bound)),))} {count}')
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {h["count"]}')
+                    lines.append(f'{name}_sum{_labels(labels)} {_number(h["sum"])}')
+                    lines.append(f'{name}_count{_labels(labels)} {h["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started'].pop()
+    if not has_request_context() or 'sql_count' not in g:
+        return
+    elapsed = time.perf_counter() - started
+    g.sql_count += 1
+    g.sql_time += elapsed
+    # Keep only the slowest few for the slow-request log
+    entry = (elapsed, ' '.join(statement.split())[:200])
+    if len(g.sql_statements) < SLOW_LOG_QUERIES:
+        heapq.heappush(g.sql_statements, entry)
+    else:
+        heapq.heappushpop(g.sql_statements, entry)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _failed_query(exception_context):
+    started = exception_context.connection and exception_context.connection.info.get('query_started')
+    if started:
+        started.pop()
+
+
+metrics = Metrics()
@@ -0,0 +1,87 @@
+import base64
+import json
+import math
+from datetime import datetime
+
+from sqlalchemy import and_, or_, text
+from app.database import db
+
+COUNT_MODES = ('exact', 'estimated', 'none')
+# Largest page the list endpoints serve, in page and cursor mode alike
+MAX_PAGE_LIMIT = 100
+
+
+def page_limit(args, default=20):
+    """The `limit` query argument, clamped to 1..MAX_PAGE_LIMIT."""
+    return min(max(args.get('limit', default, type=int), 1), MAX_PAGE_LIMIT)
+
+
+def encode_cursor(created_at, id):
+    # Opaque to clients: base64 of the last row's sort key
+    payload = json.dumps([created_at.isoformat(), id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def estimate_count(query):
+    """Planner row estimate on Postgres, exact count elsewhere."""
+    query = query.enable_eagerloads(False)
+    bind = db.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return query.order_by(None).count()
+
+    compiled = query.order_by(None).statement.compile(
+        dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db.session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_total(query, mode):
+    if mode == 'exact':
+        return query.enable_eagerloads(False).order_by(None).count()
+    if mode == 'estimated':
+        return estimate_count(query)
+    return None
+
+
+def keyset_query(query, model, cursor):
+    """Order `query` newest first on (created_at, id), starting after `cursor`."""
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < last_created_at,
+            and_(model.created_at == last_created_at, model.id < last_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def keyset_paginate(query, model, cursor, limit):
+    """
+    Page through `query` newest first on (created_at, id).
+
+    Seeks past the cursor instead of using OFFSET, so every page costs
+    the same as the first one.
+    """
+    rows = keyset_query(query, model, cursor).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+    return items, next_cursor
+
+
+def pages_for(total, per_page):
+    if total is None:
+        return None
+    return int(math.ceil(total / float(per_page))) if per_page else 0
@@ -0,0 +1,94 @@
+from datetime import date, datetime
+
+from sqlalchemy.orm import joinedload, load_only
+
+
+def plain(value):
+    """A column value as text-friendly output; the JSON provider does this for responses."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class Related:
+    """
+    A serialized field that comes from a many-to-one relationship.
+
+    With `attr` set, the field is that single attribute of the related row
+    (e.g. the creator's name) and only that column is loaded. With
+    `nested=True`, the field is the related row's full `to_dict()`.
+    """
+
+    def __init__(self, relationship, attr=None, default=None, nested=False):
+        self.relationship = relationship
+        self.attr = attr
+        self.default = default
+        self.nested = nested
+
+    def value(self, obj):
+        target = getattr(obj, self.relationship)
+        if target is None:
+            return self.default
+        if self.nested:
+            return target.to_dict()
+        return getattr(target, self.attr)
+
+    def loader(self, model):
+        rel = getattr(model, self.relationship)
+        target = rel.property.mapper.class_
+        option = joinedload(rel)
+        if self.nested:
+            return option.options(*target.serializer.options())
+        return option.load_only(getattr(target, self.attr))
+
+
+class Serializer:
+    """
+    Declares which fields a model exposes and how to load them.
+
+    Used as a class attribute on a model; `options(fields)` returns the
+    loader options that fetch exactly the columns and relationships the
+    requested fields need in a single query, and `dump(obj, fields)`
+    builds the dict without touching anything that was not loaded.
+    Values are left as loaded (datetimes included); the app's JSON
+    provider encodes them.
+    """
+
+    def __init__(self, columns, related=None, always=('id',)):
+        self.columns = tuple(columns)
+        self.related = related or {}
+        self.always = tuple(always)
+        self.fields = self.columns + tuple(self.related)
+        self.model = None
+
+    def __set_name__(self, owner, name):
+        self.model = owner
+
+    def parse(self, raw):
+        """Turn a `?fields=a,b` value into a field list (None means all)."""
+        if not raw:
+            return None
+        fields = [f.strip() for f in raw.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def options(self, fields=None):
+        wanted = self.fields if fields is None else fields
+        columns = [c for c in self.always if c not in wanted]
+        columns += [c for c in wanted if c in self.columns]
+
+        opts = [load_only(*[getattr(self.model, c) for c in columns])]
+        opts += [self.related[f].loader(self.model) for f in wanted if f in self.related]
+        return opts
+
+    def dump(self, obj, fields=None):
+        wanted = self.fields if fields is None else fields
+        data = {}
+        for name in wanted:
+            if name in self.related:
+                data[name] = self.related[name].value(obj)
+            else:
+                data[name] = getattr(obj, name)
+        return data
@@ -0,0 +1,74 @@
+import socketserver
+import threading
+from email import message_from_bytes, policy
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 smtp-sink ready')
+        envelope = {'from': None, 'to': []}
+        for raw in self.rfile:
+            command = raw.decode(errors='replace').strip()
+            verb = command[:4].upper()
+            if verb in ('HELO', 'EHLO'):
+                self.reply('250 smtp-sink')
+            elif verb == 'MAIL':
+                envelope = {'from': command.partition(':')[2].strip(' <>'), 'to': []}
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                envelope['to'].append(command.partition(':')[2].strip(' <>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for line in self.rfile:
+                    if line in (b'.\r\n', b'.\n'):
+                        break
+                    # Undo dot-stuffing
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+                self.server.received(envelope, message_from_bytes(b''.join(lines), policy=policy.default))
+                self.reply('250 OK: queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    A local SMTP server that accepts everything and keeps it in `messages`.
+
+    Stand-in for a real mail server in development and tests: point
+    MAIL_SERVER/MAIL_PORT at it with MAIL_BACKEND=smtp to exercise the
+    real delivery path. Port 0 picks a free port (see `port`).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, on_message=None):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages = []
+        self.on_message = on_message
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def received(self, envelope, message):
+        with self._lock:
+            self.messages.append((envelope, message))
+        if self.on_message:
+            self.on_message(envelope, message)
+
+    def start(self):
+        """Serve on a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True).start()
+        return self
@@ -0,0 +1,59 @@
+import queue
+import threading
+
+
+def format_event(event, data):
+    """One Server-Sent Events message; `data` is already-encoded JSON."""
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+class Subscription:
+    def __init__(self, topics, maxsize):
+        self.topics = frozenset(topics)
+        self.queue = queue.Queue(maxsize)
+
+    def get(self, timeout):
+        return self.queue.get(timeout=timeout)
+
+
+class Broadcaster:
+    """
+    Fans each published message out to every subscriber of its topic.
+
+    Messages are pre-encoded strings, so one encoding serves every
+    stream. A subscriber whose queue is full is dropped rather than
+    allowed to hold the producer up; its stream ends and EventSource
+    reconnects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(self, topics, maxsize=100):
+        subscription = Subscription(topics, maxsize)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, topic, message):
+        with self._lock:
+            subscribers = [s for s in self._subscribers if topic in s.topics]
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                self.unsubscribe(subscription)
+                # Make room for the end-of-stream marker
+                try:
+                    subscription.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                subscription.queue.put_nowait(None)
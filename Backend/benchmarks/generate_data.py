@@ -0,0 +1,244 @@
+"""
+Bulk-load a production-sized synthetic dataset.
+
+Uses batched Core INSERTs (no ORM objects) against the database in
+DATABASE_URL, then rebuilds the derived tables the ORM hooks would
+normally maintain: status counters, the revenue rollup and the search
+index.
+
+    python benchmarks/generate_data.py --parcels 1000000 --expenses 200000
+    python benchmarks/generate_data.py --parcels 50000 --expenses 10000 --months 12 --seed 7
+
+Creates admin@example.com / password123 (as seed.py does) if missing, so
+benchmarks/load_harness.py can sign in.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Roughly what production looks like: most parcels end up paid
+STATUS_MIX = {'paid': 0.55, 'pending': 0.2, 'cancelled': 0.1, 'postponed': 0.08, 'overdue': 0.07}
+
+FIRST_NAMES = ['Amina', 'Brian', 'Cynthia', 'David', 'Esther', 'Faith', 'George', 'Grace', 'Hassan', 'Irene',
+               'James', 'Joy', 'Kevin', 'Lucy', 'Mercy', 'Moses', 'Njeri', 'Otieno', 'Peter', 'Wanjiru']
+LAST_NAMES = ['Achieng', 'Kamau', 'Kariuki', 'Kiprop', 'Mutua', 'Mwangi', 'Njoroge', 'Ochieng', 'Odhiambo',
+              'Omondi', 'Otieno', 'Wafula', 'Wambui', 'Wanjiku', 'Chebet']
+PRODUCTS = ['Shoes', 'Laptop', 'Phone', 'Book', 'Watch', 'Handbag', 'Headphones', 'Dress', 'Blender',
+            'Perfume', 'Television', 'Jacket', 'Tablet', 'Speaker', 'Sunglasses']
+DESTINATIONS = ['Nairobi CBD', 'Westlands', 'Kilimani', 'Embakasi', 'Kasarani', 'Thika', 'Kiambu', 'Ruiru',
+                'Machakos', 'Nakuru', 'Naivasha', 'Eldoret', 'Kisumu', 'Mombasa', 'Nyeri', 'Meru']
+COURIERS = ['G4S', 'Wells Fargo', 'Fargo Courier', 'Sendy', 'Speedaf', None]
+CATEGORIES = ['Office Supplies', 'Transport', 'Utilities', 'Marketing', 'Rent', 'Salaries', 'Packaging', 'Fuel']
+
+
+def phone(rng):
+    return f"07{rng.randint(10000000, 99999999)}"
+
+
+def insert_batches(connection, table, rows, batch_size):
+    from sqlalchemy import insert
+
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            connection.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        connection.execute(insert(table), batch)
+        total += len(batch)
+    return total
+
+
+def ensure_users(connection, count, rng):
+    from sqlalchemy import func, insert, select
+    from app.models import User
+    from app.services.password_service import hash_password
+
+    # One hash shared by every generated user keeps this fast
+    password_hash = hash_password('password123')
+    users = User.__table__
+    if not connection.execute(select(users.c.id).where(users.c.email == 'admin@example.com')).first():
+        connection.execute(insert(users).values(
+            name='Admin User', email='admin@example.com', phone='0700000000', role='admin',
+            password_hash=password_hash, created_at=datetime.utcnow()
+        ))
+
+    existing = connection.execute(select(func.count()).select_from(users)).scalar()
+    start = existing
+    rows = [{
+        'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+        'email': f'staff{n}@synthetic.example.com', 'phone': phone(rng), 'role': 'user',
+        'password_hash': password_hash, 'created_at': datetime.utcnow()
+    } for n in range(start, start + max(count - existing, 0))]
+    if rows:
+        connection.execute(insert(users), rows)
+    return [row[0] for row in connection.execute(select(users.c.id))]
+
+
+def ensure_categories(connection):
+    from sqlalchemy import insert, select
+    from app.models import ExpenseCategory
+
+    categories = ExpenseCategory.__table__
+    existing = {row[0] for row in connection.execute(select(categories.c.name))}
+    missing = [{'name': name} for name in CATEGORIES if name not in existing]
+    if missing:
+        connection.execute(insert(categories), missing)
+    return [row[0] for row in connection.execute(select(categories.c.id))]
+
+
+def parcel_rows(count, user_ids, start, span, rng):
+    statuses = rng.choices(list(STATUS_MIX), list(STATUS_MIX.values()), k=count)
+    # Drawing from fixed pools is much cheaper than building strings per row
+    names = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+    phones = [phone(rng) for _ in range(min(count, 100_000) or 1)]
+    # Ascending like real data (ids grow with created_at), which also keeps
+    # the created_at indexes appending instead of splitting pages
+    offsets = sorted(rng.random() * span for _ in range(count))
+    now = datetime.utcnow()
+    random_ = rng.random
+    choice = rng.choice
+    for status, offset in zip(statuses, offsets):
+        created_at = start + timedelta(seconds=offset)
+        # Paid and cancelled parcels were touched again days later
+        updated_at = min(created_at + timedelta(seconds=random_() * 14 * 86400), now)
+        yield {
+            'customer_name': choice(names),
+            'phone': choice(phones),
+            'alt_phone': choice(phones) if random_() < 0.3 else None,
+            'product': choice(PRODUCTS),
+            'destination': choice(DESTINATIONS),
+            'expected_amount': round(rng.lognormvariate(8, 0.7), 2),
+            'courier': choice(COURIERS),
+            'status': status,
+            'user_id': choice(user_ids),
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
+
+
+def expense_rows(count, user_ids, category_ids, start, span, rng):
+    for offset in sorted(rng.random() * span for _ in range(count)):
+        yield {
+            'category_id': rng.choice(category_ids),
+            'user_id': rng.choice(user_ids),
+            'description': f'{rng.choice(CATEGORIES)} - synthetic',
+            'amount': round(rng.lognormvariate(7, 1.0), 2),
+            'date': start + timedelta(seconds=offset)
+        }
+
+
+def add_postponed_orders(connection, rng, batch_size):
+    """One unresolved order per postponed parcel lacking one, due from a week ago to a month ahead."""
+    from sqlalchemy import exists, select
+    from app.models import Parcel, PostponedOrder
+
+    parcels = Parcel.__table__
+    orders = PostponedOrder.__table__
+    today = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+    missing = connection.execute(select(parcels.c.id, parcels.c.updated_at).where(
+        parcels.c.status == 'postponed', ~exists().where(orders.c.parcel_id == parcels.c.id)
+    )).all()
+    rows = ({
+        'parcel_id': parcel_id,
+        # A few have no date agreed yet
+        'new_delivery_date': today + timedelta(days=rng.randint(-7, 30)) if rng.random() < 0.9 else None,
+        'notes': 'Synthetic postponement',
+        'is_resolved': False,
+        'created_at': updated_at
+    } for parcel_id, updated_at in missing)
+    return insert_batches(connection, orders, rows, batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parcels', type=int, default=1_000_000)
+    parser.add_argument('--expenses', type=int, default=200_000)
+    parser.add_argument('--users', type=int, default=50, help='total users to have, including existing ones')
+    parser.add_argument('--months', type=int, default=24, help='spread created_at/date over this many months back')
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--config', default='development', help='create_app config name')
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+    from app import create_app
+    from app.database import db
+    from app.services.analytics_service import rebuild_revenue_rollup
+    from app.services.search_service import rebuild_search_index
+    from app.services.status_service import rebuild_status_counters
+    from app.services.version_service import VERSIONED_TABLES, bump_versions
+    from app.models import Expense, Parcel
+
+    rng = random.Random(args.seed)
+    app = create_app(args.config)
+    span = args.months * 30 * 24 * 3600
+    start = datetime.utcnow() - timedelta(seconds=span)
+    started = time.perf_counter()
+
+    with app.app_context():
+        db.create_all()
+        engine = db.engine
+        sqlite = engine.dialect.name == 'sqlite'
+
+        with engine.begin() as connection:
+            if sqlite:
+                # Bulk-load settings for this connection only
+                connection.exec_driver_sql('PRAGMA cache_size = -262144')
+                connection.exec_driver_sql('PRAGMA synchronous = OFF')
+                # Index the search table once at the end instead of per row
+                for trigger in ('parcels_fts_ai', 'parcels_fts_ad', 'parcels_fts_au'):
+                    connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+            user_ids = ensure_users(connection, args.users, rng)
+            category_ids = ensure_categories(connection)
+
+            # Building each index once after the load beats updating it per row
+            indexes = [*Parcel.__table__.indexes, *Expense.__table__.indexes]
+            for index in indexes:
+                index.drop(connection, checkfirst=True)
+
+            t = time.perf_counter()
+            parcels = insert_batches(connection, Parcel.__table__,
+                                     parcel_rows(args.parcels, user_ids, start, span, rng), args.batch_size)
+            print(f"parcels: {parcels} in {time.perf_counter() - t:.1f}s")
+
+            t = time.perf_counter()
+            postponed = add_postponed_orders(connection, rng, args.batch_size)
+            print(f"postponed orders: {postponed} in {time.perf_counter() - t:.1f}s")
+
+            t = time.perf_counter()
+            expenses = insert_batches(connection, Expense.__table__,
+                                      expense_rows(args.expenses, user_ids, category_ids, start, span, rng),
+                                      args.batch_size)
+            print(f"expenses: {expenses} in {time.perf_counter() - t:.1f}s")
+
+            t = time.perf_counter()
+            for index in indexes:
+                index.create(connection)
+            print(f"{len(indexes)} indexes rebuilt in {time.perf_counter() - t:.1f}s")
+            # Invalidate every ETag a client may hold from before the load
+            bump_versions(connection, VERSIONED_TABLES)
+
+        # Bulk inserts bypass the ORM hooks; rebuild what they maintain
+        t = time.perf_counter()
+        rebuild_status_counters()
+        months = rebuild_revenue_rollup()
+        backend = rebuild_search_index()
+        if sqlite:
+            db.session.execute(text('ANALYZE'))
+            db.session.commit()
+        print(f"counters, {months}-month revenue rollup and search index ({backend}) in {time.perf_counter() - t:.1f}s")
+
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark: serialize and encode one list-endpoint page.
+
+Builds parcel rows in memory (no database), then times the full path
+api_response takes for a page of them: to_dict plus the JSON provider's
+response(). Compares the stdlib provider with isoformat done per row
+(how responses were built before) against FastJSONProvider, and shows
+what gzip and brotli do to the body.
+
+    python benchmarks/json_benchmark.py --rows 1000 --repeat 50
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    from app.models import Parcel
+    from app.utils.compression import brotli
+    from app.utils.json_provider import FastJSONProvider, orjson
+    from app.utils.serializers import plain
+
+    app = Flask(__name__)
+    now = datetime.utcnow()
+    parcels = [Parcel(
+        id=n, customer_name=f'Customer {n}', phone='0712345678', alt_phone=None, product='Laptop',
+        destination='Westlands', expected_amount=2500.5 + n, courier='G4S', status='pending', user_id=1,
+        created_at=now - timedelta(minutes=n), updated_at=now
+    ) for n in range(args.rows)]
+    for parcel in parcels:
+        # Stand-in for the joined creator so to_dict doesn't lazy-load
+        parcel.__dict__['creator'] = None
+
+    def envelope(data):
+        return {"success": True, "data": data, "message": "", "meta": {"page": 1, "total": args.rows}}
+
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def before():
+        rows = [{k: plain(v) for k, v in p.to_dict().items()} for p in parcels]
+        return stdlib.response(envelope(rows)).get_data()
+
+    def after():
+        return fast.response(envelope([p.to_dict() for p in parcels])).get_data()
+
+    with app.app_context():
+        encode_only = [p.to_dict() for p in parcels]
+        results = [
+            ('stdlib json, isoformat per row', *timed(before, args.repeat)),
+            (f'FastJSONProvider ({"orjson" if orjson else "stdlib fallback"})', *timed(after, args.repeat)),
+            ('  of which encoding only', *timed(lambda: fast.response(envelope(encode_only)).get_data(), args.repeat)),
+        ]
+
+    print(f"{args.rows} parcels per page, median of {args.repeat}")
+    for name, seconds, body in results:
+        print(f"{name:<40} {seconds * 1000:8.2f} ms  {len(body):>9} bytes")
+
+    body = results[1][2]
+    codecs = [('gzip level 6', lambda: gzip.compress(body, compresslevel=6, mtime=0))]
+    if brotli:
+        codecs.append(('brotli quality 4', lambda: brotli.compress(body, quality=4)))
+    for name, fn in codecs:
+        seconds, compressed = timed(fn, args.repeat)
+        print(f"{name:<40} {seconds * 1000:8.2f} ms  {len(compressed):>9} bytes ({len(compressed) / len(body):.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Login throughput under concurrent load.
+
+Runs the app in-process against a throwaway SQLite database and fires
+concurrent POST /api/auth/login requests from a thread pool (standing in
+for a threaded gunicorn worker), while a probe thread times GET /health
+to show whether other endpoints stay responsive during the burst.
+
+    python benchmarks/login_benchmark.py
+    python benchmarks/login_benchmark.py --methods scrypt,scrypt:16384:8:1,pbkdf2:sha256:600000 \\
+        --concurrency 32 --requests 400 --hash-workers 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = 'benchmark-password'
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(app, method, args):
+    from app.database import db
+    from app.models import User
+
+    app.config.update(
+        PASSWORD_HASH_METHOD=method,
+        PASSWORD_HASH_WORKERS=args.hash_workers,
+        PASSWORD_HASH_BACKLOG=args.backlog
+    )
+    with app.app_context():
+        User.query.delete()
+        for i in range(args.users):
+            user = User(name=f'Bench {i}', email=f'bench{i}@example.com', role='user')
+            user.set_password(PASSWORD)
+            db.session.add(user)
+        db.session.commit()
+
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        return local.client
+
+    def login(i):
+        started = time.perf_counter()
+        response = client().post('/api/auth/login', json={
+            'email': f'bench{i % args.users}@example.com', 'password': PASSWORD
+        })
+        return response.status_code, time.perf_counter() - started
+
+    probe_latencies = []
+    done = threading.Event()
+
+    def probe():
+        probe_client = app.test_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            probe_client.get('/health')
+            probe_latencies.append(time.perf_counter() - started)
+            time.sleep(0.02)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    ok = [latency for status, latency in results if status == 200]
+    busy = sum(1 for status, _ in results if status == 503)
+    return {
+        'method': method,
+        'logins_per_s': len(ok) / elapsed,
+        'p50_ms': percentile(ok, 50) * 1000,
+        'p95_ms': percentile(ok, 95) * 1000,
+        'busy_503': busy,
+        'failed': len(results) - len(ok) - busy,
+        'health_p95_ms': percentile(probe_latencies, 95) * 1000,
+        'health_max_ms': max(probe_latencies, default=0) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', default='scrypt,scrypt:16384:8:1,pbkdf2:sha256:600000',
+                        help='comma-separated werkzeug hash methods to compare')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--hash-workers', type=int, default=2, help='PASSWORD_HASH_WORKERS (0 = inline)')
+    parser.add_argument('--backlog', type=int, default=64, help='PASSWORD_HASH_BACKLOG')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'login_benchmark.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('ANALYTICS_CACHE_BACKEND', 'none')
+
+    from app import create_app
+    from app.database import db
+
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+
+    print(f"{args.requests} logins, {args.concurrency} concurrent, hash workers={args.hash_workers}")
+    print(f"{'method':<26}{'logins/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'503s':>6}{'fail':>6}{'/health p95':>13}{'max':>8}")
+    for method in args.methods.split(','):
+        r = run(app, method.strip(), args)
+        print(f"{r['method']:<26}{r['logins_per_s']:>10.1f}{r['p50_ms']:>9.0f}{r['p95_ms']:>9.0f}"
+              f"{r['busy_503']:>6}{r['failed']:>6}{r['health_p95_ms']:>13.1f}{r['health_max_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Time from container-style start command to the first successful request.
+
+Runs each start command in a shell, polls GET /health until it answers
+200, then stops the process group. Compares the old boot (init_db.py +
+gunicorn) with the current one (migrate-if-needed + preloaded gunicorn)
+against the database in DATABASE_URL, which should already be migrated
+and seeded, as on a restart or scale-out.
+
+    DATABASE_URL=sqlite:////tmp/app.db python benchmarks/startup_time.py --runs 5
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    'init_db.py + gunicorn': 'python init_db.py && exec gunicorn --bind 127.0.0.1:{port} --workers {workers} run:app',
+    'migrate-if-needed + gunicorn --preload':
+        'flask --app wsgi migrate-if-needed && GUNICORN_BIND=127.0.0.1:{port} WEB_CONCURRENCY={workers} '
+        'exec gunicorn -c gunicorn.conf.py wsgi:app',
+}
+
+
+def time_to_first_request(command, port, timeout):
+    started = time.perf_counter()
+    process = subprocess.Popen(command, shell=True, cwd=BACKEND, start_new_session=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"exited with {process.returncode}: {command}")
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"no response within {timeout}s: {command}")
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL'):
+        raise SystemExit("Set DATABASE_URL to a migrated, seeded database")
+
+    for name, template in COMMANDS.items():
+        command = template.format(port=args.port, workers=args.workers)
+        times = [time_to_first_request(command, args.port, args.timeout) for _ in range(args.runs)]
+        print(f"{name:<42} median {statistics.median(times):.2f}s  min {min(times):.2f}s  max {max(times):.2f}s")
+
+
+if __name__ == '__main__':
+    main()
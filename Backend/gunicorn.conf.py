@@ -0,0 +1,32 @@
+# gunicorn settings for the container (see Dockerfile)
+import glob
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+# Threaded workers: an open event stream (/api/events) holds a thread for
+# as long as it is open, so keep GUNICORN_THREADS above SSE_MAX_STREAMS to
+# leave threads for ordinary requests. GUNICORN_WORKER_CLASS=gevent (needs
+# the gevent package) serves each stream from a greenlet instead; raise
+# SSE_MAX_STREAMS with it
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+# Import and build the app once in the master; workers fork from it ready
+# to serve instead of each repeating the imports and create_app()
+preload_app = True
+
+
+def on_starting(server):
+    # Per-worker metric files from the previous run would be added to this one's
+    from app.utils.metrics import metrics
+    if metrics.directory:
+        for path in glob.glob(os.path.join(metrics.directory, 'worker-*.json')):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    # Never share pooled connections the master may have opened with the workers
+    from app.database import db
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
@@ -1,10 +1,12 @@
 # init_db.py
+# One-off: migrate and seed demo data. Not part of container startup.
 import os
 from datetime import datetime, timedelta
 from random import choice, randint
 
 from app import create_app, db
 from app.models import User, Parcel, PostponedOrder, Expense, ExpenseCategory
+from app.services.schema_service import upgrade_if_needed
 
 # Create app with production config
 app = create_app('production')
@@ -12,9 +14,9 @@ app = create_app('production')
 with app.app_context():
     print("🔧 Initializing database...")
     
-    # Create all tables
-    db.create_all()
-    print("✅ Tables created successfully!")
+    # Bring the schema up to date
+    upgrade_if_needed()
+    print("✅ Migrations applied!")
     
     # Only seed if database is empty (check if admin exists)
     admin_email = "admin@example.com"
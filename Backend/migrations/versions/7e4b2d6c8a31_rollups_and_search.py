@@ -0,0 +1,88 @@
+"""status counters, revenue rollup, search index and listing indexes
+
+Revision ID: 7e4b2d6c8a31
+Revises: 3c1f0a9d2b10
+Create Date: 2026-10-17 08:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4b2d6c8a31'
+down_revision = '3c1f0a9d2b10'
+branch_labels = None
+depends_on = None
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS parcels_fts USING fts5("
+    "customer_name, phone, product, destination, courier, "
+    "content='parcels', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS parcels_fts_ai AFTER INSERT ON parcels BEGIN "
+    "INSERT INTO parcels_fts(rowid, customer_name, phone, product, destination, courier) "
+    "VALUES (new.id, new.customer_name, new.phone, new.product, new.destination, new.courier); END",
+    "CREATE TRIGGER IF NOT EXISTS parcels_fts_ad AFTER DELETE ON parcels BEGIN "
+    "INSERT INTO parcels_fts(parcels_fts, rowid, customer_name, phone, product, destination, courier) "
+    "VALUES ('delete', old.id, old.customer_name, old.phone, old.product, old.destination, old.courier); END",
+    "CREATE TRIGGER IF NOT EXISTS parcels_fts_au AFTER UPDATE OF customer_name, phone, product, destination, courier "
+    "ON parcels BEGIN "
+    "INSERT INTO parcels_fts(parcels_fts, rowid, customer_name, phone, product, destination, courier) "
+    "VALUES ('delete', old.id, old.customer_name, old.phone, old.product, old.destination, old.courier); "
+    "INSERT INTO parcels_fts(rowid, customer_name, phone, product, destination, courier) "
+    "VALUES (new.id, new.customer_name, new.phone, new.product, new.destination, new.courier); END",
+    "INSERT INTO parcels_fts(parcels_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_parcels_search_trgm ON parcels USING gin (("
+    "coalesce(customer_name, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(product, '') "
+    "|| ' ' || coalesce(destination, '') || ' ' || coalesce(courier, '')) gin_trgm_ops)",
+]
+
+
+def upgrade():
+    op.create_table('parcel_status_counters',
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('status'),
+    if_not_exists=True
+    )
+    op.create_table('revenue_monthly',
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('parcel_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('month'),
+    if_not_exists=True
+    )
+    op.create_index('ix_expenses_category_id', 'expenses', ['category_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_expenses_date', 'expenses', ['date'], unique=False, if_not_exists=True)
+    op.create_index('ix_postponed_orders_queue', 'postponed_orders', ['is_resolved', 'new_delivery_date'], unique=False, if_not_exists=True)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+    # Existing rows: run `flask rebuild-status-counters` and
+    # `flask rebuild-revenue-rollup` after upgrading
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('parcels_fts_ai', 'parcels_fts_ad', 'parcels_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS parcels_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_parcels_search_trgm")
+
+    op.drop_index('ix_postponed_orders_queue', table_name='postponed_orders')
+    op.drop_index('ix_expenses_date', table_name='expenses')
+    op.drop_index('ix_expenses_category_id', table_name='expenses')
+    op.drop_table('revenue_monthly')
+    op.drop_table('parcel_status_counters')
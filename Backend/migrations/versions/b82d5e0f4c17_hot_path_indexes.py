@@ -0,0 +1,41 @@
+"""composite indexes for the hot list, stats and analytics queries
+
+Revision ID: b82d5e0f4c17
+Revises: 7e4b2d6c8a31
+Create Date: 2026-10-17 08:10:00.000000
+
+Each index matches a query shape checked by `flask check-query-plans`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b82d5e0f4c17'
+down_revision = '7e4b2d6c8a31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /api/parcels: newest first, keyset on (created_at, id), by status or creator
+    op.create_index('ix_parcels_created_at_id', 'parcels', ['created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_parcels_status_created_at', 'parcels', ['status', 'created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_parcels_user_id_created_at', 'parcels', ['user_id', 'created_at'], unique=False, if_not_exists=True)
+    # analytics_service: paid revenue by updated_at, covering expected_amount
+    op.create_index('ix_parcels_status_updated_at', 'parcels', ['status', 'updated_at', 'expected_amount'], unique=False, if_not_exists=True)
+    op.create_index('ix_parcels_updated_at', 'parcels', ['updated_at'], unique=False, if_not_exists=True)
+    # GET /api/expenses filtered by category or creator, ordered by date
+    op.create_index('ix_expenses_category_id_date', 'expenses', ['category_id', 'date'], unique=False, if_not_exists=True)
+    op.create_index('ix_expenses_user_id_date', 'expenses', ['user_id', 'date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_expenses_user_id_date', table_name='expenses')
+    op.drop_index('ix_expenses_category_id_date', table_name='expenses')
+    op.drop_index('ix_parcels_updated_at', table_name='parcels')
+    op.drop_index('ix_parcels_status_updated_at', table_name='parcels')
+    op.drop_index('ix_parcels_user_id_created_at', table_name='parcels')
+    op.drop_index('ix_parcels_status_created_at', table_name='parcels')
+    op.drop_index('ix_parcels_created_at_id', table_name='parcels')
@@ -0,0 +1,30 @@
+"""watermarks for incremental and periodic jobs
+
+Revision ID: c9e4b7a2d358
+Revises: a5d2e9f47c13
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e4b7a2d358'
+down_revision = 'a5d2e9f47c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('watermarks',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('watermarks')
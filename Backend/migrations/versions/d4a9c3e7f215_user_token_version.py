@@ -0,0 +1,30 @@
+"""users.token_version for role/version JWT claims
+
+Revision ID: d4a9c3e7f215
+Revises: b82d5e0f4c17
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a9c3e7f215'
+down_revision = 'b82d5e0f4c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases built by db.create_all() after this change already have it
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('users')}
+    if 'token_version' in columns:
+        return
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
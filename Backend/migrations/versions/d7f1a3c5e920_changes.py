@@ -0,0 +1,34 @@
+"""changes: append-only change log for delta sync
+
+Revision ID: d7f1a3c5e920
+Revises: c9e4b7a2d358
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f1a3c5e920'
+down_revision = 'c9e4b7a2d358'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_changes_changed_at', 'changes', ['changed_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_changes_changed_at', table_name='changes')
+    op.drop_table('changes')
@@ -0,0 +1,40 @@
+"""table_versions for conditional GET validators
+
+Revision ID: f3a8d1c6b754
+Revises: e7c1f4a8b902
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d1c6b754'
+down_revision = 'e7c1f4a8b902'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ('parcels', 'postponed_orders', 'expenses', 'expense_categories', 'users')
+
+
+def upgrade():
+    table = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+    existing = {row[0] for row in op.get_bind().execute(sa.text('SELECT name FROM table_versions'))}
+    now = datetime.utcnow()
+    op.bulk_insert(table, [
+        {'name': name, 'version': 0, 'updated_at': now} for name in VERSIONED_TABLES if name not in existing
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')